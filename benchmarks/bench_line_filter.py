@@ -0,0 +1,63 @@
+"""
+Benchmark --exclude-strings line filtering: per-line any() loop vs. LineFilter.
+
+Run from the repository root:
+    python -m benchmarks.bench_line_filter --lines 200000 --strings 300
+"""
+
+import random
+import argparse
+import timeit
+
+from utils.filter_utils import LineFilter
+
+def build_text(line_count, markers, seed=0):
+    """Build source-like text where a small share of lines contain a marker."""
+    rng = random.Random(seed)
+    words = ["def", "return", "value", "self", "import", "for", "in", "range", "if", "else", "None", "data"]
+    lines = []
+    for _ in range(line_count):
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        if rng.random() < 0.05:
+            line += " # " + rng.choice(markers)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+def filter_with_any(text, exclude_strings):
+    """The original per-line filtering loop."""
+    file_lines = []
+    for line in text.splitlines(True):
+        if not any(substring in line for substring in exclude_strings):
+            file_lines.append(line.rstrip('\n\r'))
+    return '\n'.join(file_lines)
+
+def filter_by_line(text, line_filter):
+    """LineFilter applied line by line."""
+    return '\n'.join(line.rstrip('\n\r') for line in text.splitlines(True) if not line_filter.excludes(line))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exclude-strings line filtering")
+    parser.add_argument("--lines", type=int, default=200000, help="Number of synthetic lines")
+    parser.add_argument("--strings", type=int, default=300, help="Number of exclude strings")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timing repetitions")
+    args = parser.parse_args()
+
+    exclude_strings = [f"GENERATED-MARKER-{index:04d}" for index in range(args.strings)]
+    text = build_text(args.lines, exclude_strings)
+    line_filter = LineFilter(exclude_strings)
+
+    expected = filter_with_any(text, exclude_strings)
+    if filter_by_line(text, line_filter) != expected or line_filter.filter_text(text)[0] != expected:
+        raise SystemExit("LineFilter results differ from the any() loop")
+
+    any_time = min(timeit.repeat(lambda: filter_with_any(text, exclude_strings), number=1, repeat=args.repeat))
+    line_time = min(timeit.repeat(lambda: filter_by_line(text, line_filter), number=1, repeat=args.repeat))
+    buffer_time = min(timeit.repeat(lambda: line_filter.filter_text(text), number=1, repeat=args.repeat))
+
+    print(f"Lines: {args.lines}, exclude strings: {args.strings}")
+    print(f"any() loop:          {any_time:.3f}s")
+    print(f"LineFilter per line: {line_time:.3f}s ({any_time / line_time:.1f}x)")
+    print(f"LineFilter buffer:   {buffer_time:.3f}s ({any_time / buffer_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
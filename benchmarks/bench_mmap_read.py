@@ -0,0 +1,71 @@
+"""
+Benchmark memory and throughput of the text and memory-mapped reading paths.
+
+Run from the repository root:
+    python -m benchmarks.bench_mmap_read --size-mb 200
+"""
+
+import os
+import random
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from utils.filter_utils import LineFilter
+from processors.content_processor import process_file
+
+def build_log_file(path, size_bytes, markers, seed=0):
+    """Write a generated log-like UTF-8 file of roughly size_bytes."""
+    rng = random.Random(seed)
+    levels = ["INFO", "DEBUG", "WARNING", "ERROR"]
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < size_bytes:
+            lines = []
+            for _ in range(1000):
+                line = f"2024-01-01 12:00:{rng.randint(0, 59):02d} {rng.choice(levels)} worker-{rng.randint(0, 99)} processed item {rng.randint(0, 10**9)}"
+                if rng.random() < 0.1:
+                    line += " " + rng.choice(markers)
+                lines.append(line + "\n")
+            chunk = "".join(lines)
+            f.write(chunk)
+            written += len(chunk)
+
+def measure(file_path, line_filter, mmap_threshold):
+    """Return (seconds, peak traced bytes, stats) for one read of file_path."""
+    # Timed and traced separately, tracemalloc slows allocations down a lot
+    start = time.perf_counter()
+    _, stats, _, _ = process_file(file_path, "bench.log", line_filter, mmap_threshold=mmap_threshold)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    process_file(file_path, "bench.log", line_filter, mmap_threshold=mmap_threshold)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory-mapped file reading")
+    parser.add_argument("--size-mb", type=int, default=200, help="Size of the generated file in megabytes")
+    args = parser.parse_args()
+
+    markers = ["heartbeat", "health-check", "GENERATED"]
+    line_filter = LineFilter(markers)
+
+    with tempfile.TemporaryDirectory() as root:
+        file_path = os.path.join(root, "bench.log")
+        build_log_file(file_path, args.size_mb * 1024 * 1024, markers)
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+
+        text_time, text_peak, text_stats = measure(file_path, line_filter, None)
+        mmap_time, mmap_peak, mmap_stats = measure(file_path, line_filter, 1)
+        if text_stats != mmap_stats:
+            raise SystemExit(f"Stats differ: {text_stats} != {mmap_stats}")
+
+        print(f"File: {size_mb:.1f} MB, {text_stats.line_count:,} lines, {text_stats.filtered_line_count:,} kept")
+        print(f"Text path: {text_time:.3f}s ({size_mb / text_time:.0f} MB/s), peak {text_peak / 2**20:.1f} MB")
+        print(f"mmap path: {mmap_time:.3f}s ({size_mb / mmap_time:.0f} MB/s), peak {mmap_peak / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    main()
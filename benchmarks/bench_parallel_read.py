@@ -0,0 +1,57 @@
+"""
+Benchmark serial vs. thread-pool file content reading.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_read --files 50000 --jobs 8
+"""
+
+import os
+import io
+import argparse
+import tempfile
+import time
+
+from utils.file_utils import PatternSet
+from processors.scan_processor import scan_directory_tree
+from processors.content_processor import write_files_content
+
+def build_small_file_tree(root, file_count, files_per_dir=100):
+    """Create file_count small Python files spread over subdirectories."""
+    for index in range(file_count):
+        dir_path = os.path.join(root, f"pkg_{index // files_per_dir:05d}")
+        if index % files_per_dir == 0:
+            os.makedirs(dir_path, exist_ok=True)
+        with open(os.path.join(dir_path, f"module_{index:06d}.py"), 'w', encoding='utf-8') as f:
+            f.write(f"# generated module {index}\n")
+            f.write("import os\n\n")
+            f.write(f"def func_{index}():\n    return {index}\n")
+
+def time_read(root, tree, jobs):
+    """Return the seconds taken to write all file contents with the given job count."""
+    out = io.StringIO()
+    start = time.perf_counter()
+    processed = write_files_content(out, root, PatternSet(["*.py"]), PatternSet([]), ["import"], tree=tree, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(processed), out.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel file content reading")
+    parser.add_argument("--files", type=int, default=50000, help="Number of synthetic files")
+    parser.add_argument("--jobs", type=int, default=8, help="Number of threads for the parallel run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        build_small_file_tree(root, args.files)
+        tree = scan_directory_tree(root, PatternSet([]))
+
+        serial_time, processed, serial_output = time_read(root, tree, 1)
+        parallel_time, _, parallel_output = time_read(root, tree, args.jobs)
+        if serial_output != parallel_output:
+            raise SystemExit("Parallel output differs from serial output")
+
+        print(f"Files: {processed}")
+        print(f"Serial:          {serial_time:.3f}s ({processed / serial_time:,.0f} files/s)")
+        print(f"Parallel ({args.jobs:>2}):   {parallel_time:.3f}s ({processed / parallel_time:,.0f} files/s)")
+
+if __name__ == "__main__":
+    main()
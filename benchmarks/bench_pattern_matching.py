@@ -0,0 +1,65 @@
+"""
+Micro-benchmark comparing match_pattern against a compiled PatternSet.
+
+Run from the repository root:
+    python -m benchmarks.bench_pattern_matching --paths 100000 --patterns 50
+"""
+
+import os
+import random
+import argparse
+import timeit
+
+from utils.file_utils import PatternSet, match_pattern
+
+def build_patterns(count):
+    """Build a realistic mix of exact names, suffix globs and general globs."""
+    exact = [".git", "node_modules", "__pycache__", ".venv", "dist", "build", ".idea", ".tox"]
+    suffixes = [f"*.{ext}" for ext in ("pyc", "pyo", "log", "tmp", "bak", "o", "so", "class", "min.js", "map")]
+    patterns = exact + suffixes
+    index = 0
+    while len(patterns) < count:
+        patterns.append(f"*/generated_{index}/*" if index % 2 else f"*cache_{index}*")
+        index += 1
+    return patterns[:count]
+
+def build_paths(count, seed=0):
+    """Build synthetic file paths with a small share of matches."""
+    rng = random.Random(seed)
+    names = ["main", "utils", "index", "model", "view", "test", "config", "README"]
+    exts = ["py", "js", "ts", "md", "txt", "pyc", "log", "json"]
+    dirs = ["src", "lib", "app", "tests", "docs", "pkg", "node_modules", "build"]
+    paths = []
+    for _ in range(count):
+        depth = rng.randint(1, 6)
+        parts = [rng.choice(dirs) for _ in range(depth)]
+        parts.append(f"{rng.choice(names)}.{rng.choice(exts)}")
+        paths.append(os.path.join("/repo", *parts))
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exclude-pattern matching")
+    parser.add_argument("--paths", type=int, default=100000, help="Number of synthetic paths")
+    parser.add_argument("--patterns", type=int, default=50, help="Number of exclude patterns")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timing repetitions")
+    args = parser.parse_args()
+
+    patterns = build_patterns(args.patterns)
+    paths = build_paths(args.paths)
+    pattern_set = PatternSet(patterns)
+
+    baseline = [match_pattern(patterns, path) for path in paths]
+    compiled = [pattern_set.matches(path) for path in paths]
+    if baseline != compiled:
+        raise SystemExit("PatternSet results differ from match_pattern")
+
+    loop_time = min(timeit.repeat(lambda: [match_pattern(patterns, p) for p in paths], number=1, repeat=args.repeat))
+    set_time = min(timeit.repeat(lambda: [pattern_set.matches(p) for p in paths], number=1, repeat=args.repeat))
+
+    print(f"Paths: {len(paths)}, patterns: {len(patterns)}, matches: {sum(compiled)}")
+    print(f"match_pattern: {loop_time:.3f}s")
+    print(f"PatternSet:    {set_time:.3f}s")
+    print(f"Speedup:       {loop_time / set_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark directory structure rendering on very deep and very wide trees.
+
+The trees are built in memory as ScanNode models, so only rendering is
+measured. The recursive renderer with string concatenation that used to
+back generate_directory_structure is kept here for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_tree_render --depth 2000 --width 1000000
+"""
+
+import io
+import os
+import sys
+import argparse
+import time
+
+from processors.scan_processor import ScanNode
+from processors.directory_processor import write_directory_structure
+
+def build_deep_tree(depth):
+    """Build a chain of nested directories depth levels deep with one file each."""
+    root = ScanNode("deep", "/deep", True)
+    node = root
+    for level in range(depth):
+        node.children.append(ScanNode(f"file_{level}.txt", os.path.join(node.path, f"file_{level}.txt"), False))
+        child = ScanNode(f"level_{level}", os.path.join(node.path, f"level_{level}"), True)
+        node.children.append(child)
+        node = child
+    return root
+
+def build_wide_tree(width, files_per_dir=1000):
+    """Build a two-level tree with width files spread over directories."""
+    root = ScanNode("wide", "/wide", True)
+    for dir_index in range(max(1, width // files_per_dir)):
+        directory = ScanNode(f"dir_{dir_index:06d}", f"/wide/dir_{dir_index:06d}", True)
+        directory.children = [
+            ScanNode(f"file_{file_index:04d}.py", f"{directory.path}/file_{file_index:04d}.py", False)
+            for file_index in range(files_per_dir)
+        ]
+        root.children.append(directory)
+    return root
+
+def render_recursive(node, indent=""):
+    """The previous recursive renderer building the result with +=."""
+    structure = ""
+    for index, child in enumerate(node.children):
+        is_last = index == len(node.children) - 1
+        connector = "└── " if is_last else "├── "
+        if child.is_dir:
+            structure += indent + connector + child.name + "/\n"
+            structure += render_recursive(child, indent + ("    " if is_last else "│   "))
+        else:
+            structure += indent + connector + child.name + "\n"
+    return structure
+
+def time_render(render, tree):
+    """Return (seconds, output length) for render(tree), or the error raised."""
+    start = time.perf_counter()
+    try:
+        output = render(tree)
+    except RecursionError as e:
+        return None, f"RecursionError: {e}"
+    return time.perf_counter() - start, len(output)
+
+def render_iterative(tree):
+    out = io.StringIO()
+    write_directory_structure(out, tree, "    ")
+    return out.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark directory structure rendering")
+    parser.add_argument("--depth", type=int, default=2000, help="Depth of the deep tree")
+    parser.add_argument("--width", type=int, default=1000000, help="Number of files in the wide tree")
+    args = parser.parse_args()
+
+    for label, tree in (("deep", build_deep_tree(args.depth)), ("wide", build_wide_tree(args.width))):
+        print(f"{label} tree (recursion limit {sys.getrecursionlimit()}):")
+        for name, render in (("recursive +=", lambda t: render_recursive(t, "    ")), ("iterative", render_iterative)):
+            elapsed, result = time_render(render, tree)
+            if elapsed is None:
+                print(f"  {name:<13} {result}")
+            else:
+                print(f"  {name:<13} {elapsed:.3f}s ({result:,} characters)")
+
+if __name__ == "__main__":
+    main()
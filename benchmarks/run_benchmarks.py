@@ -0,0 +1,220 @@
+"""
+Benchmark suite timing each processor and the full pipeline on synthetic trees.
+
+Every benchmark runs on trees generated from the presets in
+benchmarks.synthetic_tree. Timings are the best of several runs; peak
+memory is measured with tracemalloc in a separate run, so tracing does not
+distort the timings. Results are saved as JSON and can be compared against
+a saved baseline; the exit status is 1 if anything got slower or bigger
+than the threshold allows.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --output baseline.json
+    python -m benchmarks.run_benchmarks --baseline baseline.json --threshold 0.1
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from collections import OrderedDict
+
+import main as pipeline
+from benchmarks.synthetic_tree import PRESETS, FILE_PATTERNS, EXCLUDE_STRINGS, generate_tree, scale_spec, exclude_patterns_for
+from utils.file_utils import PatternSet, match_pattern
+from utils.display_utils import write_table
+from processors.scan_processor import scan_directory_tree, iter_tree_nodes
+from processors.directory_processor import generate_directory_structure
+from processors.file_processor import count_files_in_tree, summarize_character_counts
+from processors.content_processor import read_files_with_names_or_extensions, write_files_content
+
+def build_benchmarks(root, spec, output_dir):
+    """
+    Build the benchmarks for one generated tree.
+
+    Args:
+        root (str): Root of the generated tree
+        spec (TreeSpec): Spec the tree was generated from
+        output_dir (str): Directory outside the tree for report files
+
+    Returns:
+        list: Tuples (name, callable) in run order
+    """
+    exclude = exclude_patterns_for(spec)
+    exclude_patterns = PatternSet(exclude)
+    file_patterns = PatternSet(FILE_PATTERNS)
+    tree = scan_directory_tree(root, exclude_patterns)
+    unfiltered_paths = [(node.path, node.name) for node in iter_tree_nodes(scan_directory_tree(root, PatternSet([])))]
+    file_stats = write_files_content(io.StringIO(), root, file_patterns, exclude_patterns, EXCLUDE_STRINGS, tree=tree)
+    report_path = os.path.join(output_dir, "report.txt")
+    argv = ["main.py", "--path", root, "--exclude", *exclude, "--file-names", *FILE_PATTERNS,
+            "--exclude-strings", *EXCLUDE_STRINGS, "--output-file", report_path, "--log-level", "ERROR"]
+
+    def match_all():
+        for path, name in unfiltered_paths:
+            if not match_pattern(exclude_patterns, path):
+                match_pattern(file_patterns, name)
+
+    def run_main():
+        saved_argv = sys.argv
+        sys.argv = argv
+        try:
+            with redirect_stdout(io.StringIO()):
+                pipeline.main()
+        finally:
+            sys.argv = saved_argv
+        # main() reports errors instead of raising them
+        if not os.path.isfile(report_path):
+            raise RuntimeError(f"Pipeline run did not produce {report_path}")
+        os.remove(report_path)
+
+    return [
+        ("scan", lambda: scan_directory_tree(root, exclude_patterns)),
+        ("pattern_matching", match_all),
+        ("structure", lambda: generate_directory_structure(root, exclude_patterns, tree=tree)),
+        ("content", lambda: read_files_with_names_or_extensions(root, file_patterns, exclude_patterns, EXCLUDE_STRINGS, tree=tree)),
+        ("count", lambda: count_files_in_tree(tree)),
+        ("chars", lambda: summarize_character_counts(file_stats)),
+        ("pipeline", run_main),
+    ]
+
+def measure(func, repeat):
+    """
+    Time func and measure its peak traced memory.
+
+    Args:
+        func (callable): Benchmark to run
+        repeat (int): Number of timed runs
+
+    Returns:
+        dict: Best wall clock seconds and peak traced bytes
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+def run_suite(presets, scale, repeat):
+    """
+    Generate a tree per preset and run every benchmark on it.
+
+    Args:
+        presets (list): Preset names
+        scale (float): Factor applied to files per directory and file size
+        repeat (int): Number of timed runs per benchmark
+
+    Returns:
+        tuple: (results keyed by "preset.benchmark", spec and generated counts per preset)
+    """
+    results = OrderedDict()
+    trees = OrderedDict()
+    for preset in presets:
+        spec = scale_spec(PRESETS[preset], scale)
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as output_dir:
+            trees[preset] = dict(spec._asdict(), **generate_tree(root, spec))
+            for name, func in build_benchmarks(root, spec, output_dir):
+                results[f"{preset}.{name}"] = measure(func, repeat)
+                print(f"{preset}.{name}: {results[f'{preset}.{name}']['seconds']:.4f}s", file=sys.stderr)
+    return results, trees
+
+def compare(results, baseline, threshold, min_seconds):
+    """
+    Compare results against a baseline.
+
+    Timings below min_seconds in the baseline are too noisy to compare and
+    only their memory is checked.
+
+    Args:
+        results (dict): Current results keyed by benchmark
+        baseline (dict): Baseline results keyed by benchmark
+        threshold (float): Allowed relative increase, e.g. 0.1 for 10%
+        min_seconds (float): Smallest baseline timing that is compared
+
+    Returns:
+        tuple: (list of row tuples, list of regressed benchmark names)
+    """
+    rows = []
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            rows.append((name, "-", f"{current['seconds']:.4f}", "-", "-", f"{current['peak_bytes']:,}", "new"))
+            continue
+
+        time_ratio = current["seconds"] / previous["seconds"] if previous["seconds"] else 1.0
+        memory_ratio = current["peak_bytes"] / previous["peak_bytes"] if previous["peak_bytes"] else 1.0
+        slower = previous["seconds"] >= min_seconds and time_ratio > 1 + threshold
+        bigger = memory_ratio > 1 + threshold
+        status = "REGRESSION" if slower or bigger else "ok"
+        if slower or bigger:
+            regressions.append(name)
+        rows.append((
+            name,
+            f"{previous['seconds']:.4f}",
+            f"{current['seconds']:.4f}",
+            f"{time_ratio:.2f}x",
+            f"{previous['peak_bytes']:,}",
+            f"{current['peak_bytes']:,}",
+            status,
+        ))
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic trees")
+    parser.add_argument("--presets", nargs='*', choices=sorted(PRESETS), default=list(PRESETS), help="Tree presets to benchmark (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor applied to files per directory and file size")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per benchmark, the best is kept")
+    parser.add_argument("--output", help="Save the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown or memory growth (default: 0.1)")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="Baseline timings below this are not compared (default: 0.005)")
+    args = parser.parse_args()
+
+    results, trees = run_suite(args.presets, args.scale, args.repeat)
+
+    if args.output:
+        report = OrderedDict([
+            ("python", platform.python_version()),
+            ("platform", platform.platform()),
+            ("scale", args.scale),
+            ("repeat", args.repeat),
+            ("trees", trees),
+            ("results", results),
+        ])
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)["results"]
+        rows, regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        write_table(sys.stdout, ["Benchmark", "Base (s)", "Now (s)", "Ratio", "Base peak", "Now peak", "Status"], rows, ["l", "r", "r", "r", "r", "r", "l"])
+        print()
+        if regressions:
+            print(f"{len(regressions)} regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"No regressions above {args.threshold:.0%}")
+    else:
+        rows = [(name, f"{result['seconds']:.4f}", f"{result['peak_bytes']:,}") for name, result in results.items()]
+        write_table(sys.stdout, ["Benchmark", "Seconds", "Peak bytes"], rows, ["l", "r", "r"])
+        print()
+
+if __name__ == "__main__":
+    main()
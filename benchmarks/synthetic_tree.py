@@ -0,0 +1,168 @@
+"""
+Parameterized synthetic directory trees for benchmarks.
+
+A TreeSpec describes the shape of a tree; generate_tree writes it to disk
+deterministically, so the same spec and seed always produce the same tree.
+
+Run from the repository root to inspect a tree:
+    python -m benchmarks.synthetic_tree --preset exclude_heavy /tmp/tree
+"""
+
+import os
+import random
+import argparse
+from collections import namedtuple
+
+TreeSpec = namedtuple("TreeSpec", [
+    "width",            # Subdirectories per directory
+    "depth",            # Directory levels below the root
+    "files_per_dir",    # Files in every directory
+    "file_size",        # Approximate size of each file in bytes
+    "binary_ratio",     # Fraction of files written as binary data
+    "excluded_ratio",   # Fraction of entries matching the exclude patterns
+    "extra_patterns",   # Additional exclude patterns that never match
+    "seed",             # Random seed deciding which entries are binary or excluded
+])
+
+PRESETS = {
+    "small": TreeSpec(width=4, depth=3, files_per_dir=10, file_size=2048, binary_ratio=0.05, excluded_ratio=0.1, extra_patterns=0, seed=1),
+    "wide": TreeSpec(width=200, depth=1, files_per_dir=50, file_size=512, binary_ratio=0.0, excluded_ratio=0.0, extra_patterns=0, seed=2),
+    "deep": TreeSpec(width=1, depth=200, files_per_dir=5, file_size=512, binary_ratio=0.0, excluded_ratio=0.0, extra_patterns=0, seed=3),
+    "large_files": TreeSpec(width=2, depth=2, files_per_dir=4, file_size=2 * 1024 * 1024, binary_ratio=0.0, excluded_ratio=0.0, extra_patterns=0, seed=4),
+    "binary_heavy": TreeSpec(width=4, depth=3, files_per_dir=20, file_size=8192, binary_ratio=0.5, excluded_ratio=0.0, extra_patterns=0, seed=5),
+    "exclude_heavy": TreeSpec(width=6, depth=3, files_per_dir=20, file_size=1024, binary_ratio=0.0, excluded_ratio=0.5, extra_patterns=200, seed=6),
+}
+
+# Names given to excluded directories and extensions given to excluded files
+EXCLUDED_DIR_NAMES = ("__pycache__", "node_modules", "build", ".git")
+EXCLUDED_FILE_EXTENSIONS = (".pyc", ".log")
+
+# Extensions of regular files; FILE_PATTERNS matches the first two
+FILE_EXTENSIONS = (".py", ".txt", ".md")
+FILE_PATTERNS = ["*.py", "*.txt"]
+
+# Lines containing these are dropped by the content filter
+EXCLUDE_STRINGS = ["TODO", "secret"]
+
+_TEXT_LINES = (
+    "import os\n",
+    "def handler(event, context):\n",
+    "    return {'status': 200}\n",
+    "# TODO: remove before release\n",
+    "    value = compute(value) * 2\n",
+    "secret = 'not really'\n",
+    "\n",
+)
+
+def scale_spec(spec, scale):
+    """
+    Scale the number of files and their size of a spec.
+
+    Args:
+        spec (TreeSpec): Tree spec
+        scale (float): Factor applied to files_per_dir and file_size
+
+    Returns:
+        TreeSpec: Scaled spec
+    """
+    return spec._replace(
+        files_per_dir=max(1, int(spec.files_per_dir * scale)),
+        file_size=max(1, int(spec.file_size * scale)),
+    )
+
+def exclude_patterns_for(spec):
+    """
+    Get the exclude patterns matching the excluded entries of a spec.
+
+    Args:
+        spec (TreeSpec): Tree spec
+
+    Returns:
+        list: Exclude patterns
+    """
+    patterns = list(EXCLUDED_DIR_NAMES) + [f"*{extension}" for extension in EXCLUDED_FILE_EXTENSIONS]
+    patterns.extend(f"*.unused{index}" for index in range(spec.extra_patterns))
+    return patterns
+
+def _text_content(size):
+    lines = []
+    written = 0
+    while written < size:
+        line = _TEXT_LINES[len(lines) % len(_TEXT_LINES)]
+        lines.append(line)
+        written += len(line)
+    return "".join(lines)
+
+def _binary_content(size):
+    return (bytes(range(256)) * (size // 256 + 1))[:size]
+
+def generate_tree(root, spec):
+    """
+    Write the tree described by spec below root.
+
+    Args:
+        root (str): Existing directory the tree is created in
+        spec (TreeSpec): Tree spec
+
+    Returns:
+        dict: Numbers of directories, files, binary files and excluded entries created
+    """
+    rng = random.Random(spec.seed)
+    counts = {"directories": 0, "files": 0, "binary_files": 0, "excluded_entries": 0}
+    text = _text_content(spec.file_size)
+    binary = _binary_content(spec.file_size)
+    stack = [(root, 0)]
+
+    while stack:
+        dir_path, level = stack.pop()
+
+        for index in range(spec.files_per_dir):
+            if rng.random() < spec.excluded_ratio:
+                extension = EXCLUDED_FILE_EXTENSIONS[index % len(EXCLUDED_FILE_EXTENSIONS)]
+                counts["excluded_entries"] += 1
+            else:
+                extension = FILE_EXTENSIONS[index % len(FILE_EXTENSIONS)]
+            file_path = os.path.join(dir_path, f"file_{index:05d}{extension}")
+
+            if rng.random() < spec.binary_ratio:
+                with open(file_path, 'wb') as f:
+                    f.write(binary)
+                counts["binary_files"] += 1
+            else:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            counts["files"] += 1
+
+        if level == spec.depth:
+            continue
+        for index in range(spec.width):
+            if rng.random() < spec.excluded_ratio:
+                name = EXCLUDED_DIR_NAMES[index % len(EXCLUDED_DIR_NAMES)]
+                if os.path.exists(os.path.join(dir_path, name)):
+                    name = f"dir_{index:05d}"
+                else:
+                    counts["excluded_entries"] += 1
+            else:
+                name = f"dir_{index:05d}"
+            child_path = os.path.join(dir_path, name)
+            os.mkdir(child_path)
+            counts["directories"] += 1
+            stack.append((child_path, level + 1))
+
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic directory tree")
+    parser.add_argument("root", help="Directory the tree is created in")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small", help="Tree spec preset")
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor applied to files per directory and file size")
+    args = parser.parse_args()
+
+    os.makedirs(args.root, exist_ok=True)
+    spec = scale_spec(PRESETS[args.preset], args.scale)
+    counts = generate_tree(args.root, spec)
+    print(", ".join(f"{name}: {value:,}" for name, value in counts.items()))
+    print(f"Exclude patterns: {' '.join(exclude_patterns_for(spec)[:8])}{' ...' if spec.extra_patterns else ''}")
+
+if __name__ == "__main__":
+    main()
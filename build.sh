@@ -13,7 +13,7 @@ echo "Setting up Python environment..."
 python3 -m venv --copies venv
 source venv/bin/activate
 pip install --upgrade pip
-pip install pyinstaller argparse==1.4.0 prettytable==3.10.0
+pip install pyinstaller argparse==1.4.0
 
 # Создание директории для сборки, если ее нет
 mkdir -p "$DIST_DIR"
@@ -1,14 +1,39 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import cProfile
+import multiprocessing
 import argparse
 from datetime import datetime
 
 from utils.logging_utils import setup_logging
-from processors.directory_processor import generate_directory_structure
-from processors.file_processor import count_files_in_directory, get_file_character_counts
-from processors.content_processor import read_files_with_names_or_extensions
-from utils.display_utils import create_directory_count_table, create_character_count_table
+from utils.file_utils import PatternSet
+from utils.cache_utils import ScanCache
+from utils.filter_utils import LineFilter
+from utils.gitignore_utils import GitignoreRules, IGNORE_FILE_NAMES
+from utils.format_utils import create_record_writer
+from utils.profiling_utils import Profiler, profile_phase
+from processors.scan_processor import ScanLimits, scan_directory_tree, scan_directory_tree_parallel, iter_tree_nodes, iter_tree_depths
+from processors.directory_processor import write_directory_structure
+from processors.file_processor import count_files_in_tree, compute_directory_file_counts, summarize_character_counts
+from processors.content_processor import write_files_content, find_matching_files, iter_file_blocks
+from processors.watch_processor import LiveTree, create_watcher, watch_changes
+from utils.display_utils import select_rows, write_directory_count_table, write_character_count_table
+
+def non_negative_int(value):
+    """Argument type for integers of at least 0."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {value}")
+    return number
+
+def positive_int(value):
+    """Argument type for integers of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or greater, got {value}")
+    return number
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -20,8 +45,34 @@ def parse_arguments():
     parser.add_argument("--log-file", nargs='?', const="", help="File to save log to, if not specified logs to console, if specified but empty logs to default file in the parsed directory")
     parser.add_argument("--log-level", default="INFO", help="Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)")
     parser.add_argument("--output-file", nargs='?', const="", help="File to save output to, if specified but empty saves to default file in the parsed directory")
+    parser.add_argument("--max-file-size", type=int, help="Skip reading content of files larger than this many bytes")
+    parser.add_argument("--mmap-threshold", type=int, default=16 * 1024 * 1024, help="Read files of at least this many bytes through a memory map (default: 16 MiB)")
+    parser.add_argument("--jobs", type=positive_int, default=1, help="Number of threads reading file contents concurrently")
+    parser.add_argument("--workers", type=positive_int, default=1, help="Number of worker processes scanning subtrees in parallel")
+    parser.add_argument("--cache-dir", help="Directory for a persistent scan cache reused across runs")
+    parser.add_argument("--cache-max-mb", type=int, default=256, help="Maximum size of cached data in megabytes (default: 256)")
+    parser.add_argument("--respect-gitignore", action='store_true', help="Also exclude entries ignored by .gitignore and .ignore files in the directory tree")
+    parser.add_argument("--max-depth", type=non_negative_int, help="Only descend this many directory levels below the path")
+    parser.add_argument("--max-entries-per-dir", type=non_negative_int, help="Only include the first N entries of each directory")
+    parser.add_argument("--max-total-entries", type=non_negative_int, help="Stop scanning after N entries, filling the top levels first")
+    parser.add_argument("--top", type=positive_int, help="Only show the N largest directories/files in the count tables")
+    parser.add_argument("--stats", nargs='?', const="", help="Record per-phase timings and counters, add them to the report and save them as JSON to this file, if specified but empty saves to default file in the parsed directory")
+    parser.add_argument("--stats-top", type=int, default=10, help="Number of slowest directory listings kept by --stats (default: 10)")
+    parser.add_argument("--profile", nargs='?', const="", help="Like --stats, and also save a cProfile dump to this file, if specified but empty saves to default file in the parsed directory")
+    parser.add_argument("--watch", action='store_true', help="Keep running and re-emit the report whenever the directory changes")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Seconds without further changes before --watch re-emits the report (default: 0.5)")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between mtime polls when --watch cannot use inotify (default: 2)")
+    parser.add_argument("--format", choices=['text', 'jsonl', 'binary'], default='text', help="Output format: human-readable text, JSON lines, or compact binary records")
     parser.add_argument("--display", choices=['structure', 'count', 'content', 'all'], default='all', help="Display Directory Structure, Directory File Count, Files Content, or all")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.watch and get_scan_limits(args) is not None:
+        parser.error("--watch cannot be combined with --max-depth, --max-entries-per-dir or --max-total-entries")
+    return args
+
+def get_scan_limits(args):
+    """Get the traversal limits requested on the command line, None if there are none."""
+    limits = ScanLimits(args.max_depth, args.max_entries_per_dir, args.max_total_entries)
+    return limits if any(limit is not None for limit in limits) else None
 
 
 
@@ -39,6 +90,12 @@ Display Mode: {args.display}
         header += f"Excluded Patterns: {', '.join(args.exclude)}\n"
     if args.exclude_strings:
         header += f"Content Filters: {', '.join(args.exclude_strings)}\n"
+    if args.respect_gitignore:
+        header += f"Ignore Files: {', '.join(IGNORE_FILE_NAMES)}\n"
+    limits = get_scan_limits(args)
+    if limits is not None:
+        names = ["max depth", "max entries per directory", "max total entries"]
+        header += f"Scan Limits: {', '.join(f'{name} {value}' for name, value in zip(names, limits) if value is not None)}\n"
     
     header += f"\n"
     return header
@@ -46,6 +103,241 @@ Display Mode: {args.display}
 def format_section_divider(title):
     """Create a formatted section divider."""
     return f"\n\n{title.upper()}\n"
+
+def write_text_report(out, args, tree, exclude_patterns, file_patterns, logger, cache=None, profiler=None, file_records=None):
+    """
+    Write the human-readable report, section by section.
+
+    Args:
+        out (file-like): Text stream the report is written to
+        args (argparse.Namespace): Parsed command line arguments
+        tree (ScanNode): Scanned tree of args.path
+        exclude_patterns (PatternSet): Compiled exclude patterns
+        file_patterns (PatternSet): Compiled file name patterns
+        logger (logging.Logger): Logger for debug information
+        cache (ScanCache): Persistent scan cache, if any
+        profiler (Profiler): Profiler timing each section, if any
+        file_records (dict): Content records of earlier reads keyed by file path, if any
+    """
+    file_stats = []
+    out.write(format_output_header(args))
+
+    # Generate directory structure if requested
+    if args.display in ['structure', 'all']:
+        with profile_phase(profiler, "structure"):
+            last_folder_name = os.path.basename(os.path.normpath(args.path))
+            logger.info(f"Generating directory structure for {args.path}")
+            out.write(format_section_divider("Directory Structure"))
+            out.write(f"{last_folder_name}/\n")
+            write_directory_structure(out, tree, "    ")
+
+    # Read file contents if requested
+    if args.display in ['content', 'all'] and args.file_names:
+        with profile_phase(profiler, "content"):
+            logger.info("Reading files with specified names or extensions")
+            out.write(format_section_divider("Files Content"))
+            file_stats = write_files_content(out, args.path, file_patterns, exclude_patterns, args.exclude_strings, logger, tree=tree, jobs=args.jobs, cache=cache, max_file_size=args.max_file_size, mmap_threshold=args.mmap_threshold, profiler=profiler, file_records=file_records)
+
+    # Count files in directories if requested
+    if args.display in ['count', 'all']:
+        with profile_phase(profiler, "count"):
+            dir_file_count = count_files_in_tree(tree, logger)
+            total_files = sum(file_count for _, file_count in dir_file_count)
+
+            rows = select_rows(dir_file_count, key=lambda x: x[1], top=args.top)
+            out.write(format_section_divider(f"Directory File Count (Total: {total_files})"))
+            write_directory_count_table(out, rows)
+            out.write("\n")
+            if len(rows) < len(dir_file_count):
+                out.write(f"Showing the {len(rows)} largest of {len(dir_file_count)} directories\n")
+
+    # Generate character counts for processed files if in 'all' mode
+    if args.display == 'all':
+        with profile_phase(profiler, "chars"):
+            if file_stats:
+                logger.info("Generating file character count table for processed files")
+                file_char_counts, total_chars = summarize_character_counts(file_stats)
+
+                rows = select_rows(file_char_counts, key=lambda x: x[0], top=args.top)
+                out.write(format_section_divider(f"File Character Counts (Total: {total_chars:,} characters)"))
+                write_character_count_table(out, rows)
+                if len(rows) < len(file_char_counts):
+                    out.write(f"\nShowing the {len(rows)} largest of {len(file_char_counts)} files")
+            else:
+                logger.info("No files processed for character counts.")
+                out.write(format_section_divider("File Character Counts"))
+                out.write("\nNo files matched the specified file names or extensions.")
+
+    # Timings so far, the saved statistics also include closing the output
+    if profiler is not None:
+        out.write(format_section_divider("Performance Statistics"))
+        profiler.write_summary(out)
+    out.write(f"\nANALYSIS COMPLETED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+def write_structured_report(writer, args, tree, exclude_patterns, file_patterns, logger, cache=None, profiler=None, file_records=None):
+    """
+    Write the report as machine-readable records, one record at a time.
+
+    Args:
+        writer (JsonlWriter or BinaryWriter): Record writer
+        args (argparse.Namespace): Parsed command line arguments
+        tree (ScanNode): Scanned tree of args.path
+        exclude_patterns (PatternSet): Compiled exclude patterns
+        file_patterns (PatternSet): Compiled file name patterns
+        logger (logging.Logger): Logger for debug information
+        cache (ScanCache): Persistent scan cache, if any
+        profiler (Profiler): Profiler timing each section, if any
+        file_records (dict): Content records of earlier reads keyed by file path, if any
+    """
+    writer.write("header", path=os.path.abspath(args.path), generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), display=args.display)
+
+    # Tree nodes in pre-order, the same order as the text tree
+    if args.display in ['structure', 'all']:
+        with profile_phase(profiler, "structure"):
+            logger.info(f"Generating directory structure for {args.path}")
+            if tree.elided:
+                writer.write("elided", path=".", count=tree.elided)
+            for node, depth in iter_tree_depths(tree):
+                writer.write("node", depth=depth, is_dir=node.is_dir, name=node.name, path=os.path.relpath(node.path, args.path))
+                if node.elided:
+                    writer.write("elided", path=os.path.relpath(node.path, args.path), count=node.elided)
+
+    file_stats = []
+    if args.display in ['content', 'all'] and args.file_names:
+        with profile_phase(profiler, "content"):
+            logger.info("Reading files with specified names or extensions")
+            matching_files = find_matching_files(tree, args.path, file_patterns)
+            file_blocks = iter_file_blocks(matching_files, LineFilter(args.exclude_strings), logger, args.jobs, cache, args.max_file_size, args.mmap_threshold, profiler, file_records)
+            for (file_path, relative_path), (block, stats, file_content, skip_reason) in zip(matching_files, file_blocks):
+                write_file_record(writer, relative_path, stats, file_content, skip_reason)
+                if stats is not None:
+                    file_stats.append(stats)
+            writer.write("summary", section="content", total=len(file_stats))
+
+    if args.display in ['count', 'all']:
+        with profile_phase(profiler, "count"):
+            counts = compute_directory_file_counts(tree)
+            total_files = 0
+            for node in iter_tree_nodes(tree):
+                if node.is_dir:
+                    direct, recursive = counts[node.path]
+                    total_files += recursive
+                    writer.write("count", path=os.path.relpath(node.path, args.path), direct=direct, file_count=recursive)
+            writer.write("summary", section="count", total=total_files)
+
+    if args.display == 'all':
+        with profile_phase(profiler, "chars"):
+            for stats in file_stats:
+                writer.write("chars", path=stats.relative_path, char_count=stats.char_count)
+            writer.write("summary", section="chars", total=sum(stats.char_count for stats in file_stats))
+
+def _resolve_output_path(args, file_name, kind, extension):
+    """Resolve the path of an extra output file, relative paths being relative to the parsed directory."""
+    if file_name == "":
+        file_name = f"directory_structure_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return file_name if os.path.isabs(file_name) else os.path.join(args.path, file_name)
+
+def _report_saved(message, logger, output_file_path):
+    """Log a saved file, printing it too unless the report itself goes to stdout."""
+    if output_file_path is not None:
+        print(message)
+    logger.info(message)
+
+def write_file_record(writer, relative_path, stats, file_content, skip_reason):
+    """Write the record of a content file, or of the reason it was skipped."""
+    if stats is None:
+        writer.write("skipped_file", path=relative_path, reason=skip_reason)
+        return
+    writer.write(
+        "file",
+        path=relative_path,
+        lines=stats.filtered_line_count,
+        original_lines=stats.line_count,
+        chars=stats.char_count,
+        bytes=stats.byte_size,
+        content=file_content,
+    )
+
+def write_structured_update(writer, args, live, changes):
+    """
+    Write the records of one batch of watched changes.
+
+    Added and removed subtrees are always reported; content, count and
+    character records follow the display mode like the full report.
+
+    Args:
+        writer (JsonlWriter or BinaryWriter): Record writer
+        args (argparse.Namespace): Parsed command line arguments
+        live (LiveTree): Watched tree the changes were applied to
+        changes (TreeChanges): Changes of the batch
+    """
+    total = len(changes.added) + len(changes.removed) + len(changes.counts) + len(changes.files)
+    writer.write("update", generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), changes=total)
+
+    for node in changes.removed:
+        writer.write("removed", path=os.path.relpath(node.path, args.path), is_dir=node.is_dir)
+    for node in changes.added:
+        writer.write("added", path=os.path.relpath(node.path, args.path), is_dir=node.is_dir)
+        if node.is_dir:
+            for child in iter_tree_nodes(node):
+                writer.write("added", path=os.path.relpath(child.path, args.path), is_dir=child.is_dir)
+
+    if args.display in ['content', 'all'] and args.file_names:
+        for file_path in changes.files:
+            _, stats, file_content, skip_reason = live.file_records[file_path]
+            write_file_record(writer, os.path.relpath(file_path, args.path), stats, file_content, skip_reason)
+        writer.write("summary", section="content", total=live.content_total)
+
+    if args.display in ['count', 'all']:
+        for dir_path in changes.counts:
+            if dir_path != live.tree.path:
+                direct, recursive = live.counts[dir_path]
+                writer.write("count", path=os.path.relpath(dir_path, args.path), direct=direct, file_count=recursive)
+        writer.write("summary", section="count", total=live.count_total)
+
+    if args.display == 'all':
+        for file_path in changes.files:
+            stats = live.file_records[file_path][1]
+            if stats is not None:
+                writer.write("chars", path=stats.relative_path, char_count=stats.char_count)
+        writer.write("summary", section="chars", total=live.chars_total)
+
+def run_watch(out, writer, args, live, exclude_patterns, file_patterns, logger, rewrite):
+    """
+    Re-emit the report whenever the watched tree changes, until interrupted.
+
+    Text reports are written again in full from the live tree, without
+    rescanning or rereading unchanged files; record formats get only the
+    records of each batch of changes appended.
+
+    Args:
+        out (file-like): Stream the report is written to
+        writer (JsonlWriter or BinaryWriter): Record writer, None for text reports
+        args (argparse.Namespace): Parsed command line arguments
+        live (LiveTree): Tree kept up to date
+        exclude_patterns (PatternSet): Compiled exclude patterns
+        file_patterns (PatternSet): Compiled file name patterns
+        logger (logging.Logger): Logger for debug information
+        rewrite (bool): Whether out is a file that is rewritten for every text report
+    """
+    watcher = create_watcher(live, args.poll_interval, logger)
+    try:
+        for changes in watch_changes(live, watcher, args.debounce, logger):
+            if writer is not None:
+                write_structured_update(writer, args, live, changes)
+            else:
+                if rewrite:
+                    out.seek(0)
+                    out.truncate()
+                write_text_report(out, args, live.tree, exclude_patterns, file_patterns, logger, file_records=live.file_records)
+                if not rewrite:
+                    out.write("\n")
+            out.flush()
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped")
+    finally:
+        watcher.close()
+
 def main():
     """
     Main function to run the directory structure analyzer.
@@ -72,80 +364,116 @@ def main():
             print(f"Please check the log file at {os.path.abspath(log_file)} for more details.")
         return
 
-    output = format_output_header(args)
-    processed_files = []
+    out = None
+    output_file_path = None
+    cache = None
+    profiler = None
+    cprofile = None
+    live = None
 
     try:
-        exclude_patterns = args.exclude
-        exclude_strings = args.exclude_strings
-
-        # Generate directory structure if requested
-        if args.display in ['structure', 'all']:
-            last_folder_name = os.path.basename(os.path.normpath(args.path))
-            logger.info(f"Generating directory structure for {args.path}")
-            directory_structure = f"{last_folder_name}/\n" + generate_directory_structure(args.path, exclude_patterns, "    ", logger=logger)
-            output += format_section_divider("Directory Structure")
-            output += directory_structure
+        if args.stats is not None or args.profile is not None:
+            profiler = Profiler(args.stats_top)
+        if args.profile is not None:
+            cprofile = cProfile.Profile()
+            cprofile.enable()
 
-        # Read file contents if requested
-        if args.display in ['content', 'all'] and args.file_names:
-            logger.info("Reading files with specified names or extensions")
-            file_content, processed_files = read_files_with_names_or_extensions(args.path, args.file_names, exclude_patterns, exclude_strings, logger)
-            output += format_section_divider("Files Content")
-            output += file_content
+        exclude_patterns = PatternSet(args.exclude)
+        file_patterns = PatternSet(args.file_names)
+        gitignore = GitignoreRules(args.path, logger=logger) if args.respect_gitignore else None
 
-        # Count files in directories if requested
-        if args.display in ['count', 'all']:
-            dir_file_count = []
-            total_files = 0
-            for root, dirs, files in os.walk(args.path):
-                from utils.file_utils import match_pattern
-                dirs[:] = [d for d in dirs if not match_pattern(exclude_patterns, os.path.join(root, d))]
-                for d in dirs:
-                    dir_path = os.path.join(root, d)
-                    file_count = count_files_in_directory(dir_path, exclude_patterns, logger)
-                    dir_file_count.append((dir_path, file_count))
-                    total_files += file_count
-
-            dir_file_count.sort(key=lambda x: x[1], reverse=True)
-            table = create_directory_count_table(dir_file_count)
-            output += format_section_divider(f"Directory File Count (Total: {total_files})")
-            output += str(table) + "\n"
-
-        # Generate character counts for processed files if in 'all' mode
-        if args.display == 'all':
-            if processed_files:
-                logger.info("Generating file character count table for processed files")
-                file_char_counts, total_chars = get_file_character_counts(processed_files, args.path, exclude_patterns, logger=logger)
-                file_char_counts.sort(key=lambda x: x[0], reverse=True)
+        if args.cache_dir:
+            cache_settings = {
+                "exclude": args.exclude,
+                "file_names": args.file_names,
+                "exclude_strings": args.exclude_strings,
+            }
+            cache = ScanCache(args.cache_dir, args.path, cache_settings, args.cache_max_mb * 1024 * 1024, logger)
+            logger.info(f"Using scan cache {cache.path}")
 
-                table = create_character_count_table(file_char_counts)
-                output += format_section_divider(f"File Character Counts (Total: {total_chars:,} characters)")
-                output += str(table)
+        # Scan the tree once, every section renders from the same model
+        logger.info(f"Scanning {args.path}")
+        limits = get_scan_limits(args)
+        with profile_phase(profiler, "scan"):
+            if args.workers > 1 and limits is None:
+                if cache is not None:
+                    logger.info("Directory listings are not cached when scanning with worker processes")
+                if profiler is not None:
+                    logger.info("Directory listings in worker processes are not included in the statistics")
+                tree = scan_directory_tree_parallel(args.path, exclude_patterns, args.workers, logger, gitignore)
             else:
-                logger.info("No files processed for character counts.")
-                output += format_section_divider("File Character Counts")
-                output += "\nNo files matched the specified file names or extensions."
-        output += f"\nANALYSIS COMPLETED: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        # Save output to file if requested
+                if args.workers > 1:
+                    logger.info("Scan limits are applied by a single scanning process, ignoring --workers")
+                if cache is not None and gitignore is not None:
+                    logger.info("Directory listings are not cached with --respect-gitignore")
+                tree = scan_directory_tree(args.path, exclude_patterns, logger, cache, profiler, limits, gitignore)
+
+        # Resolve every file this run writes up front, so watch mode can leave them out
         if args.output_file is not None:
             if args.output_file == "":
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_filename = f"directory_structure_{timestamp}.txt"
+                extension = {"text": "txt", "jsonl": "jsonl", "binary": "bin"}[args.format]
+                output_filename = f"directory_structure_{timestamp}.{extension}"
             else:
                 output_filename = args.output_file
-
             output_file_path = output_filename if os.path.isabs(output_filename) else os.path.join(args.path, output_filename)
+        profile_path = _resolve_output_path(args, args.profile, "profile", "prof") if cprofile is not None else None
+        stats_path = _resolve_output_path(args, args.stats or "", "stats", "json") if profiler is not None else None
+
+        # Watch mode keeps every content record, so the file contents are read up front
+        if args.watch:
+            with profile_phase(profiler, "content"):
+                read_content = args.display in ['content', 'all']
+                written_paths = [path for path in (output_file_path, log_file, stats_path, profile_path) if path]
+                live = LiveTree(tree, exclude_patterns, file_patterns, LineFilter(args.exclude_strings), read_content, logger,
+                                args.jobs, cache, args.max_file_size, args.mmap_threshold, profiler, gitignore, written_paths)
+        file_records = live.file_records if live is not None else None
+
+        # Stream the report to the output file if requested, otherwise to stdout
+        if output_file_path is not None:
+            if args.format == 'text':
+                out = open(output_file_path, 'w', encoding='utf-8')
+            else:
+                out = open(output_file_path, 'wb')
+        else:
+            out = sys.stdout if args.format == 'text' else sys.stdout.buffer
+
+        # Time every write to the output as its own phase
+        if profiler is not None:
+            out = profiler.wrap_stream(out)
+
+        writer = None
+        if args.format == 'text':
+            write_text_report(out, args, tree, exclude_patterns, file_patterns, logger, cache, profiler, file_records)
+        else:
+            writer = create_record_writer(args.format, out)
+            write_structured_report(writer, args, tree, exclude_patterns, file_patterns, logger, cache, profiler, file_records)
+
+        if output_file_path is not None:
+            if live is not None:
+                out.flush()
+            else:
+                out.close()
 
-            with open(output_file_path, 'w', encoding='utf-8') as f:
-                f.write(output)
-            
             # Use absolute paths for better clickability
             abs_output_path = os.path.abspath(output_file_path)
             print(f"Output saved to {abs_output_path}")
             logger.info(f"Output saved to {abs_output_path}")
         else:
-            print(output)
+            if args.format == 'text':
+                out.write("\n")
+            out.flush()
+
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(profile_path)
+            _report_saved(f"Profile saved to {os.path.abspath(profile_path)}", logger, output_file_path)
+        if profiler is not None:
+            profiler.write_json(stats_path)
+            _report_saved(f"Statistics saved to {os.path.abspath(stats_path)}", logger, output_file_path)
+
+        if live is not None:
+            run_watch(out, writer, args, live, exclude_patterns, file_patterns, logger, rewrite=output_file_path is not None)
 
     except Exception as e:
         logger.error(f"An error occurred: {e}")
@@ -154,10 +482,18 @@ def main():
             abs_log_path = os.path.abspath(log_file)
             print(f"Please check the log file at {abs_log_path} for more details.")
     finally:
+        if cprofile is not None:
+            cprofile.disable()
+        if cache is not None:
+            cache.close()
+        if output_file_path is not None and out is not None and not out.closed:
+            out.close()
         logger.info("Script has finished execution.")
         if log_file:
             abs_log_path = os.path.abspath(log_file)
             print(f"Log file saved to {abs_log_path}")
 
 if __name__ == "__main__":
+    # Frozen builds start --workers processes with spawn, which needs this before anything else runs
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
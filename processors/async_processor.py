@@ -0,0 +1,100 @@
+"""
+Asyncio scanning API for embedding directory structure analysis in services.
+
+Example:
+    async for record in scan("/repo", exclude=[".git"], file_names=["*.py"]):
+        if isinstance(record, TreeEntry):
+            ...
+        else:
+            ...
+"""
+
+import os
+import asyncio
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from utils.file_utils import PatternSet, match_pattern
+from utils.filter_utils import LineFilter
+from utils.gitignore_utils import GitignoreRules
+from processors.scan_processor import list_directory
+from processors.content_processor import process_file
+
+# A directory or file found while scanning; depth 0 are the children of the root
+TreeEntry = namedtuple("TreeEntry", ["path", "relative_path", "name", "is_dir", "depth"])
+
+# A content file: stats and content are None when the file was skipped and
+# skip_reason says why, block is the formatted text the report would contain for the file.
+FileRecord = namedtuple("FileRecord", ["path", "relative_path", "stats", "content", "block", "skip_reason"])
+
+async def scan(path, exclude=(), file_names=(), exclude_strings=(), list_concurrency=4, read_concurrency=8,
+               max_file_size=None, mmap_threshold=16 * 1024 * 1024, respect_gitignore=False, logger=None):
+    """
+    Scan a directory tree asynchronously, yielding records as they become available.
+
+    Directory listings and file reads run in a thread pool with separate
+    concurrency bounds. The entries of a directory are yielded in sorted
+    order right after it has been listed, always after the directory's own
+    entry; FileRecords are yielded as soon as their file has been read.
+    Closing or cancelling the consumer cancels all work not yet started.
+
+    Args:
+        path (str): Directory path to scan
+        exclude (list): Patterns to exclude directories/files
+        file_names (list): File names or extensions to read content from
+        exclude_strings (list): Substrings to exclude lines containing them from file contents
+        list_concurrency (int): Maximum number of directories listed at once
+        read_concurrency (int): Maximum number of files read at once
+        max_file_size (int): Files larger than this many bytes are skipped, no limit if None
+        mmap_threshold (int): Files of at least this many bytes are read through a memory map, never if None
+        respect_gitignore (bool): Drop entries ignored by .gitignore and .ignore files
+        logger (logging.Logger): Logger for debug information
+
+    Yields:
+        TreeEntry or FileRecord: Scan records
+    """
+    exclude_patterns = exclude if isinstance(exclude, PatternSet) else PatternSet(exclude)
+    file_patterns = file_names if isinstance(file_names, PatternSet) else PatternSet(file_names)
+    line_filter = LineFilter(exclude_strings)
+    gitignore = GitignoreRules(path, logger=logger) if respect_gitignore else None
+
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=list_concurrency + read_concurrency)
+    dir_backlog = deque([(path, 0)])
+    file_backlog = deque()
+    listing = {}
+    reading = {}
+
+    try:
+        while dir_backlog or file_backlog or listing or reading:
+            while dir_backlog and len(listing) < list_concurrency:
+                dir_path, depth = dir_backlog.popleft()
+                future = loop.run_in_executor(executor, list_directory, dir_path, exclude_patterns, logger, gitignore)
+                listing[future] = (dir_path, depth)
+            while file_backlog and len(reading) < read_concurrency:
+                file_path, relative_path = file_backlog.popleft()
+                future = loop.run_in_executor(
+                    executor, process_file, file_path, relative_path, line_filter, logger, max_file_size, mmap_threshold
+                )
+                reading[future] = (file_path, relative_path)
+
+            done, _ = await asyncio.wait(list(listing) + list(reading), return_when=asyncio.FIRST_COMPLETED)
+
+            for future in done:
+                if future in listing:
+                    dir_path, depth = listing.pop(future)
+                    for name, is_dir, descend in future.result() or []:
+                        entry_path = os.path.join(dir_path, name)
+                        relative_path = os.path.relpath(entry_path, path)
+                        yield TreeEntry(entry_path, relative_path, name, is_dir, depth)
+                        if descend:
+                            dir_backlog.append((entry_path, depth + 1))
+                        elif not is_dir and file_patterns and match_pattern(file_patterns, name):
+                            file_backlog.append((entry_path, relative_path))
+                else:
+                    file_path, relative_path = reading.pop(future)
+                    block, stats, file_content, skip_reason = future.result()
+                    yield FileRecord(file_path, relative_path, stats, file_content, block, skip_reason)
+    finally:
+        for future in list(listing) + list(reading):
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -2,10 +2,40 @@
 Content processing functionality for directory structure analysis.
 """
 
+import io
 import os
-from utils.file_utils import match_pattern
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from utils.file_utils import match_pattern, is_binary_block, SNIFF_BLOCK_SIZE
+from utils.filter_utils import LineFilter
+from processors.scan_processor import scan_directory_tree, iter_tree_nodes
+from processors.file_processor import FileStats
 
-def read_files_with_names_or_extensions(base_path, names_or_extensions, exclude_patterns, exclude_strings, logger=None):
+def find_matching_files(tree, base_path, names_or_extensions):
+    """
+    Find files in a scanned tree matching specified names or extensions.
+    
+    Args:
+        tree (ScanNode): Root node of the scanned tree
+        base_path (str): Base directory path
+        names_or_extensions (list): File names or extensions to match
+        
+    Returns:
+        list: Tuples (file_path, relative_path) sorted by relative path
+    """
+    matching_files = []
+    if not names_or_extensions:
+        return matching_files
+        
+    for node in iter_tree_nodes(tree):
+        if not node.is_dir and match_pattern(names_or_extensions, node.name):
+            matching_files.append((node.path, os.path.relpath(node.path, base_path)))
+    
+    # Sort files by path for consistent output
+    matching_files.sort(key=lambda x: x[1])
+    return matching_files
+
+def read_files_with_names_or_extensions(base_path, names_or_extensions, exclude_patterns, exclude_strings, logger=None, tree=None, jobs=1):
     """
     Read contents of files matching specified names or extensions.
     
@@ -15,92 +45,289 @@ def read_files_with_names_or_extensions(base_path, names_or_extensions, exclude_
         exclude_patterns (list): Patterns to exclude files/directories
         exclude_strings (list): Substrings to exclude from file content
         logger (logging.Logger): Logger for debug information
+        tree (ScanNode): Previously scanned tree for base_path, scanned on demand if None
+        jobs (int): Number of threads reading files concurrently
         
     Returns:
         tuple: (formatted content string, list of processed file paths)
     """
-    content = ""
-    processed_files = []
+    buffer = io.StringIO()
+    file_stats = write_files_content(buffer, base_path, names_or_extensions, exclude_patterns, exclude_strings, logger, tree, jobs)
+    return buffer.getvalue(), [stats.file_path for stats in file_stats]
+
+def write_files_content(out, base_path, names_or_extensions, exclude_patterns, exclude_strings, logger=None, tree=None, jobs=1, cache=None, max_file_size=None, mmap_threshold=None, profiler=None, file_records=None):
+    """
+    Write contents of files matching specified names or extensions to a stream.
+    
+    Each file's block is written as soon as it has been read, so only one
+    file's content is held in memory at a time (a bounded window of files
+    when reading with several jobs).
+    
+    Args:
+        out (file-like): Stream the formatted content is written to
+        base_path (str): Base directory path
+        names_or_extensions (list): File names or extensions to match
+        exclude_patterns (list): Patterns to exclude files/directories
+        exclude_strings (list): Substrings to exclude from file content
+        logger (logging.Logger): Logger for debug information
+        tree (ScanNode): Previously scanned tree for base_path, scanned on demand if None
+        jobs (int): Number of threads reading files concurrently
+        cache (ScanCache): Persistent cache of file read results, if any
+        max_file_size (int): Files larger than this many bytes are skipped, no limit if None
+        mmap_threshold (int): Files of at least this many bytes are read through a memory map, never if None
+        profiler (Profiler): Profiler recording file counters, if any
+        file_records (dict): Results of earlier reads keyed by file path, reused and filled in if given
+        
+    Returns:
+        list: FileStats records of the processed files
+    """
+    file_stats = []
     total_files = 0
+    skipped_files = 0
     total_lines = 0
+    written_chars = 0
     
-    # Collect all matching files first
-    matching_files = []
-    for root, dirs, files in os.walk(base_path):
-        dirs[:] = [d for d in dirs if not match_pattern(exclude_patterns, os.path.join(root, d))]
-        
-        for file in files:
-            file_path = os.path.join(root, file)
-            
-            if not match_pattern(exclude_patterns, file_path):
-                if names_or_extensions and match_pattern(names_or_extensions, file):
-                    relative_path = os.path.relpath(file_path, base_path)
-                    matching_files.append((file_path, relative_path))
+    def write(text):
+        nonlocal written_chars
+        written_chars += len(text)
+        out.write(text)
     
-    # Sort files by path for consistent output
-    matching_files.sort(key=lambda x: x[1])
+    # Collect all matching files first
+    if tree is None:
+        tree = scan_directory_tree(base_path, exclude_patterns, logger, cache, profiler)
+    matching_files = find_matching_files(tree, base_path, names_or_extensions)
     
     # Add summary header
-    content += f"Base path: {base_path}\n"
-    content += f"Found {len(matching_files)} files matching patterns: {', '.join(names_or_extensions)}\n\n"
+    write(f"Base path: {base_path}\n")
+    write(f"Found {len(matching_files)} files matching patterns: {', '.join(names_or_extensions)}\n\n")
     
     # Process each file
-    for file_path, relative_path in matching_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if logger:
-                    logger.debug(f"Reading content of {file_path}")
-                
-                # Read and filter content
-                file_lines = []
-                original_line_count = 0
-                
-                for line in f:
-                    original_line_count += 1
-                    # Check if line should be excluded
-                    should_exclude = any(substring in line for substring in exclude_strings)
-                    if not should_exclude:
-                        file_lines.append(line.rstrip('\n\r'))
-                
-                filtered_line_count = len(file_lines)
-                file_content = '\n'.join(file_lines)
-                
-                # Add file header with metadata
-                content += f"\nFile: {relative_path}\n"
-                content += f"Path: {file_path}\n"
-                content += f"Lines: {filtered_line_count}"
-                if original_line_count != filtered_line_count:
-                    content += f" (filtered from {original_line_count})"
-                content += f"\nSize: {len(file_content)} characters\n\n"
+    line_filter = LineFilter(exclude_strings)
+    file_blocks = iter_file_blocks(matching_files, line_filter, logger, jobs, cache, max_file_size, mmap_threshold, profiler, file_records)
+    for block, stats, _, _ in file_blocks:
+        write(block)
+        if stats is not None:
+            file_stats.append(stats)
+            total_files += 1
+            total_lines += stats.filtered_line_count
+        else:
+            skipped_files += 1
+    
+    # Add summary footer
+    write(f"\nCONTENT ANALYSIS SUMMARY\n")
+    write(f"Total files processed: {total_files}\n")
+    if skipped_files:
+        write(f"Files skipped: {skipped_files}\n")
+    write(f"Total lines: {total_lines}\n")
+    write(f"Total characters: {written_chars}\n")
+    if exclude_strings:
+        write(f"Excluded patterns: {', '.join(exclude_strings)}\n")
+    write(f"\n")
                 
-                # Add the actual content
-                if file_content.strip():  # Only add non-empty files
-                    content += file_content + "\n"
+    return file_stats
+
+def iter_file_blocks(matching_files, line_filter, logger=None, jobs=1, cache=None, max_file_size=None, mmap_threshold=None, profiler=None, file_records=None):
+    """
+    Yield formatted file blocks in the order of matching_files.
+    
+    With more than one job, files are read in a thread pool while keeping
+    at most a few blocks per thread in flight. With a cache, files whose
+    mtime, size and inode are unchanged are not read at all. Files found in
+    file_records are taken from there without any filesystem access.
+    
+    Args:
+        matching_files (list): Tuples (file_path, relative_path)
+        line_filter (LineFilter): Compiled filter for lines to exclude
+        logger (logging.Logger): Logger for debug information
+        jobs (int): Number of threads reading files concurrently
+        cache (ScanCache): Persistent cache of file read results, if any
+        max_file_size (int): Files larger than this many bytes are skipped, no limit if None
+        mmap_threshold (int): Files of at least this many bytes are read through a memory map, never if None
+        profiler (Profiler): Profiler recording file counters, if any
+        file_records (dict): Results of earlier reads keyed by file path, reused and filled in if given
+        
+    Yields:
+        tuple: (formatted block, FileStats or None, filtered content or None, skip reason or None),
+            stats and content being None exactly when the file was skipped
+    """
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    max_pending = jobs * 4 if executor is not None else 1
+    pending = deque()
+    
+    def resolve(item):
+        file_path, st, result, source = item
+        if isinstance(result, Future):
+            result = result.result()
+        block, stats, file_content, skip_reason = result
+        if file_records is not None:
+            file_records[file_path] = result
+        if profiler is not None and source != "record":
+            _record_file(profiler, stats, source)
+        if cache is not None and st is not None and file_content is not None:
+            cache.put_file(file_path, st, file_content, stats.char_count, stats.line_count, stats.filtered_line_count)
+        return result
+    
+    try:
+        for file_path, relative_path in matching_files:
+            st = None
+            if file_records is not None and file_path in file_records:
+                result = file_records[file_path]
+                source = "record"
+            else:
+                st = _stat_file(file_path) if cache is not None else None
+                cached = None
+                # Files over the size limit are skipped even if an earlier run cached them
+                if st is not None and (max_file_size is None or st.st_size <= max_file_size):
+                    cached = cache.get_file(file_path, st)
+                if cached is not None:
+                    file_content, char_count, line_count, filtered_line_count = cached
+                    stats = FileStats(file_path, relative_path, char_count, line_count, filtered_line_count, st.st_size)
+                    result = (_format_file_block(file_path, relative_path, file_content, stats), stats, file_content, None)
+                    st = None
+                    source = "cache"
+                elif executor is not None:
+                    result = executor.submit(process_file, file_path, relative_path, line_filter, logger, max_file_size, mmap_threshold)
+                    source = "read"
                 else:
-                    content += "[Empty file or all content filtered]\n"
+                    result = process_file(file_path, relative_path, line_filter, logger, max_file_size, mmap_threshold)
+                    source = "read"
+            pending.append((file_path, st, result, source))
+            
+            while len(pending) >= max_pending:
+                yield resolve(pending.popleft())
+        while pending:
+            yield resolve(pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+def _record_file(profiler, stats, source):
+    """Update the file counters of a profiler for one processed file."""
+    profiler.count("files_stated")
+    if source == "cache":
+        profiler.count("file_cache_hits")
+    elif stats is None:
+        profiler.count("files_skipped")
+    else:
+        profiler.count("files_read")
+        profiler.count("bytes_read", stats.byte_size)
+        profiler.count("lines_filtered", stats.line_count - stats.filtered_line_count)
+
+def _stat_file(file_path):
+    """Stat a file, returning None if it cannot be stat'ed."""
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+def process_file(file_path, relative_path, line_filter, logger=None, max_file_size=None, mmap_threshold=None):
+    """
+    Read and filter a single file and format its content block.
+    
+    Args:
+        file_path (str): Path of the file to read
+        relative_path (str): Path shown in the block header
+        line_filter (LineFilter): Compiled filter for lines to exclude
+        logger (logging.Logger): Logger for debug information
+        max_file_size (int): Files larger than this many bytes are skipped, no limit if None
+        mmap_threshold (int): Files of at least this many bytes are read through a memory map, never if None
+        
+    Returns:
+        tuple: (formatted block, FileStats or None, filtered content or None, skip reason or None),
+            stats and content being None exactly when the file was skipped
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            byte_size = os.fstat(f.fileno()).st_size
+            if max_file_size is not None and byte_size > max_file_size:
+                if logger:
+                    logger.info(f"Large file skipped ({byte_size} bytes): {file_path}")
+                return _skipped_file(relative_path, f"FILE TOO LARGE - SKIPPED ({byte_size:,} bytes)")
                 
-                processed_files.append(file_path)
-                total_files += 1
-                total_lines += filtered_line_count
+            # Sniff the first block before doing any decode work
+            head = f.read(SNIFF_BLOCK_SIZE)
+            if is_binary_block(head):
+                if logger:
+                    logger.warning(f"Binary file skipped: {file_path}")
+                return _skipped_file(relative_path, "BINARY FILE - SKIPPED")
                 
-        except UnicodeDecodeError:
-            if logger:
-                logger.warning(f"Binary file skipped: {file_path}")
-            content += f"\nFile: {relative_path}\n"
-            content += f"[BINARY FILE - SKIPPED]\n\n"
-        except Exception as e:
             if logger:
-                logger.error(f"Failed to read {file_path}: {e}")
-            content += f"\nFile: {relative_path}\n"
-            content += f"[ERROR READING FILE: {e}]\n\n"
-    
-    # Add summary footer
-    content += f"\nCONTENT ANALYSIS SUMMARY\n"
-    content += f"Total files processed: {total_files}\n"
-    content += f"Total lines: {total_lines}\n"
-    content += f"Total characters: {len(content)}\n"
-    if exclude_strings:
-        content += f"Excluded patterns: {', '.join(exclude_strings)}\n"
-    content += f"\n"
+                logger.debug(f"Reading content of {file_path}")
                 
-    return content, processed_files
\ No newline at end of file
+            # Large files are scanned at the bytes level through a memory map
+            if mmap_threshold is not None and byte_size >= max(mmap_threshold, 1):
+                mapped = line_filter.filter_mapped_file(f)
+                if mapped is not None:
+                    file_content, char_count, original_line_count, filtered_line_count = mapped
+                    stats = FileStats(file_path, relative_path, char_count, original_line_count, filtered_line_count, byte_size)
+                    return _format_file_block(file_path, relative_path, file_content, stats), stats, file_content, None
+                    
+            data = head + f.read()
+            
+        # Decode with the same universal newline handling as text mode
+        text = data.decode('utf-8')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+            
+        # Filter the whole content in bulk
+        file_content, original_line_count, filtered_line_count = line_filter.filter_text(text)
+        
+        stats = FileStats(
+            file_path,
+            relative_path,
+            len(text),
+            original_line_count,
+            filtered_line_count,
+            byte_size,
+        )
+        return _format_file_block(file_path, relative_path, file_content, stats), stats, file_content, None
+        
+    except UnicodeDecodeError:
+        if logger:
+            logger.warning(f"Binary file skipped: {file_path}")
+        return _skipped_file(relative_path, "BINARY FILE - SKIPPED")
+    except Exception as e:
+        if logger:
+            logger.error(f"Failed to read {file_path}: {e}")
+        return _skipped_file(relative_path, f"ERROR READING FILE: {e}")
+
+def _format_file_block(file_path, relative_path, file_content, stats):
+    """
+    Format the content block of a file that was read successfully.
+    
+    Args:
+        file_path (str): Path of the file
+        relative_path (str): Path shown in the block header
+        file_content (str): Filtered file content
+        stats (FileStats): Stats record of the file
+        
+    Returns:
+        str: Formatted block
+    """
+    # Add file header with metadata
+    block = f"\nFile: {relative_path}\n"
+    block += f"Path: {file_path}\n"
+    block += f"Lines: {stats.filtered_line_count}"
+    if stats.line_count != stats.filtered_line_count:
+        block += f" (filtered from {stats.line_count})"
+    block += f"\nSize: {len(file_content)} characters\n\n"
+    
+    # Add the actual content
+    if file_content.strip():  # Only add non-empty files
+        block += file_content + "\n"
+    else:
+        block += "[Empty file or all content filtered]\n"
+    return block
+
+def _skipped_file(relative_path, reason):
+    """
+    Build the result of a skipped file, its block being formatted from the reason.
+    
+    Args:
+        relative_path (str): Path shown in the block header
+        reason (str): Reason the file was skipped, e.g. "BINARY FILE - SKIPPED"
+        
+    Returns:
+        tuple: (formatted block, None, None, reason)
+    """
+    return f"\nFile: {relative_path}\n[{reason}]\n\n", None, None, reason
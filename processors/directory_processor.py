@@ -2,10 +2,85 @@
 Directory processing functionality for directory structure analysis.
 """
 
-import os
-from utils.file_utils import match_pattern
+import io
+from processors.scan_processor import scan_directory_tree
 
-def generate_directory_structure(path, exclude_patterns, indent="", is_last=True, logger=None):
+def format_elided_marker(count):
+    """
+    Format the marker shown in place of entries left out by scan limits.
+
+    Args:
+        count (int): Number of entries left out
+
+    Returns:
+        str: Marker text, e.g. "… 48,210 more entries"
+    """
+    return f"… {count:,} more {'entry' if count == 1 else 'entries'}"
+
+def write_directory_structure(out, node, indent="", chunk_lines=4096):
+    """
+    Write a scanned directory node as a text tree.
+    
+    The tree is walked with an explicit stack, so depth is not limited by
+    the recursion limit, and lines are written to out in chunks. Directories
+    with entries left out by scan limits end with an elided-count marker.
+    
+    Args:
+        out (file-like): Stream the formatted lines are written to
+        node (ScanNode): Scanned directory node
+        indent (str): Current indentation level
+        chunk_lines (int): Number of lines buffered per write
+    """
+    lines = []
+    # Each frame is [directory node, index of the next child, indent of the children]
+    stack = [[node, 0, indent]]
+    while stack:
+        frame = stack[-1]
+        directory, index, prefix = frame
+        children = directory.children
+        # The elided-count marker takes the place of the last entry
+        last_index = len(children) - 1 if not directory.elided else len(children)
+        while index < len(children):
+            child = children[index]
+            index += 1
+            connector = "└── " if index > last_index else "├── "
+            if not child.is_dir:
+                lines.append(prefix + connector + child.name + "\n")
+                continue
+                
+            lines.append(prefix + connector + child.name + "/\n")
+            if child.children or child.elided:
+                frame[1] = index
+                stack.append([child, 0, prefix + ("    " if index > last_index else "│   ")])
+                break
+        else:
+            if directory.elided:
+                lines.append(prefix + "└── " + format_elided_marker(directory.elided) + "\n")
+            stack.pop()
+            
+        if len(lines) >= chunk_lines:
+            out.write("".join(lines))
+            lines.clear()
+            
+    if lines:
+        out.write("".join(lines))
+
+def render_directory_structure(node, indent=""):
+    """
+    Render a scanned directory node as a text tree.
+    
+    Args:
+        node (ScanNode): Scanned directory node
+        indent (str): Current indentation level
+        
+    Returns:
+        str: Formatted directory structure as text
+    """
+    buffer = io.StringIO()
+    write_directory_structure(buffer, node, indent)
+    return buffer.getvalue()
+
+def generate_directory_structure(path, exclude_patterns, indent="", is_last=True, logger=None, tree=None, limits=None):
     """
     Generate a text representation of directory structure.
     
@@ -15,42 +90,18 @@ def generate_directory_structure(path, exclude_patterns, indent="", is_last=True
         indent (str): Current indentation level
         is_last (bool): Whether this is the last item at this level
         logger (logging.Logger): Logger for debug information
+        tree (ScanNode): Previously scanned tree for path, scanned on demand if None
+        limits (ScanLimits): Traversal limits of the on-demand scan, unlimited if None
         
     Returns:
         str: Formatted directory structure as text
     """
-    structure = ""
-    try:
-        items = sorted(os.listdir(path))
-    except Exception as e:
-        if logger:
-            logger.error(f"Cannot list directory {path}: {e}")
-        return structure
+    if tree is None:
+        tree = scan_directory_tree(path, exclude_patterns, logger, limits=limits)
+
+    structure = render_directory_structure(tree, indent)
 
-    for index, item in enumerate(items):
-        item_path = os.path.join(path, item)
-        
-        if match_pattern(exclude_patterns, item_path):
-            if logger:
-                logger.debug(f"Excluded {item_path}")
-            continue
-            
-        connector = "└── " if index == len(items) - 1 else "├── "
-        
-        if os.path.isdir(item_path):
-            structure += indent + connector + item + "/\n"
-            sub_indent = indent + ("    " if index == len(items) - 1 else "│   ")
-            structure += generate_directory_structure(
-                item_path, 
-                exclude_patterns, 
-                sub_indent, 
-                index == len(items) - 1,
-                logger
-            )
-        else:
-            structure += indent + connector + item + "\n"
-            
     if logger:
         logger.debug(f"Generated structure for {path}")
         
-    return structure
\ No newline at end of file
+    return structure
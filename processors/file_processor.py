@@ -2,8 +2,19 @@
 File processing functionality for directory structure analysis.
 """
 
-import os
-from utils.file_utils import match_pattern
+from collections import namedtuple
+from processors.scan_processor import scan_directory_tree, iter_tree_nodes
+
+# Per-file record emitted by the content pass: char_count and line_count
+# describe the unfiltered file, filtered_line_count what was kept.
+FileStats = namedtuple("FileStats", [
+    "file_path",
+    "relative_path",
+    "char_count",
+    "line_count",
+    "filtered_line_count",
+    "byte_size",
+])
 
 def count_files_in_directory(path, exclude_patterns, logger=None):
     """
@@ -17,53 +28,75 @@ def count_files_in_directory(path, exclude_patterns, logger=None):
     Returns:
         int: Number of files
     """
-    count = 0
-    for root, dirs, files in os.walk(path):
-        dirs[:] = [d for d in dirs if not match_pattern(exclude_patterns, os.path.join(root, d))]
-        files = [f for f in files if not match_pattern(exclude_patterns, os.path.join(root, f))]
-        count += len(files)
+    tree = scan_directory_tree(path, exclude_patterns, logger)
+    count = compute_directory_file_counts(tree)[tree.path][1]
     
     if logger:
         logger.debug(f"Counted {count} files in {path}")
         
     return count
 
-def get_file_character_counts(file_paths, base_path, exclude_patterns, logger=None):
+def compute_directory_file_counts(tree):
     """
-    Get character counts for a list of files.
+    Compute direct and recursive file counts for every directory in one post-order pass.
     
     Args:
-        file_paths (list): List of file paths
-        base_path (str): Base directory for relative path calculation
-        exclude_patterns (list): Patterns to exclude
-        logger (logging.Logger): Logger for debug information
+        tree (ScanNode): Root node of the scanned tree
         
     Returns:
-        tuple: (list of tuples (char_count, relative_path), total character count)
+        dict: Mapping of directory_path to tuple (direct_count, recursive_count), root included
     """
-    file_char_counts = []
-    total_chars = 0
-    
-    for file_path in file_paths:
-        # Check if file is excluded by patterns
-        if match_pattern(exclude_patterns, file_path):
-            if logger:
-                logger.debug(f"Excluded from character count: {file_path}")
+    counts = {}
+    # Each directory is pushed twice: once to expand it, once to aggregate
+    # after all of its subdirectories have been aggregated.
+    stack = [(tree, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children if child.is_dir)
             continue
             
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                char_count = len(content)
-                total_chars += char_count
-                relative_path = os.path.relpath(file_path, base_path)
-                file_char_counts.append((char_count, relative_path))
-                
-                if logger:
-                    logger.debug(f"Counted {char_count} characters in {file_path}")
-                    
-        except Exception as e:
-            if logger:
-                logger.error(f"Failed to read {file_path}: {e}")
-                
-    return file_char_counts, total_chars
\ No newline at end of file
+        direct = 0
+        recursive = 0
+        for child in node.children:
+            if child.is_dir:
+                recursive += counts[child.path][1]
+            else:
+                direct += 1
+        counts[node.path] = (direct, direct + recursive)
+        
+    return counts
+
+def count_files_in_tree(tree, logger=None):
+    """
+    Count files in every directory of a scanned tree and its subdirectories.
+    
+    Args:
+        tree (ScanNode): Root node of the scanned tree
+        logger (logging.Logger): Logger for debug information
+        
+    Returns:
+        list: List of tuples (directory_path, file_count) for every directory below the root
+    """
+    counts = compute_directory_file_counts(tree)
+    dir_file_count = [(node.path, counts[node.path][1]) for node in iter_tree_nodes(tree) if node.is_dir]
+    
+    if logger:
+        logger.debug(f"Counted files in {len(dir_file_count)} directories under {tree.path}")
+        
+    return dir_file_count
+
+def summarize_character_counts(file_stats):
+    """
+    Get character counts from the stats records of the content pass.
+    
+    Args:
+        file_stats (list): List of FileStats records
+        
+    Returns:
+        tuple: (list of tuples (char_count, relative_path), total character count)
+    """
+    file_char_counts = [(stats.char_count, stats.relative_path) for stats in file_stats]
+    total_chars = sum(stats.char_count for stats in file_stats)
+    return file_char_counts, total_chars
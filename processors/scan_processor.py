@@ -0,0 +1,319 @@
+"""
+Filesystem scanning functionality for directory structure analysis.
+
+The scan walks the tree once with os.scandir and keeps the result in an
+in-memory tree model, so every report section can be rendered without
+touching the filesystem again.
+"""
+
+import os
+import time
+import logging
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from utils.file_utils import match_pattern
+
+# Traversal limits; None means unlimited. Depth 1 are the children of the root.
+ScanLimits = namedtuple("ScanLimits", ["max_depth", "max_entries_per_dir", "max_total_entries"])
+
+class ScanNode:
+    """
+    A single directory or file in the scanned tree.
+
+    Attributes:
+        name (str): Entry name
+        path (str): Entry path (joined from the scanned root)
+        is_dir (bool): Whether the entry is a directory
+        children (list): Sorted child nodes for directories, None for files
+        elided (int): Number of entries of the directory left out by scan limits
+    """
+
+    __slots__ = ("name", "path", "is_dir", "children", "elided")
+
+    def __init__(self, name, path, is_dir):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.children = [] if is_dir else None
+        self.elided = 0
+
+    def __repr__(self):
+        kind = "dir" if self.is_dir else "file"
+        return f"ScanNode({kind}, {self.path!r})"
+
+def scan_directory_tree(path, exclude_patterns, logger=None, cache=None, profiler=None, limits=None, gitignore=None):
+    """
+    Scan a directory tree once into an in-memory model.
+
+    Entries matching exclude patterns are dropped and excluded directories
+    are never listed. Symlinked directories are kept as entries but not
+    descended into, the same way os.walk treats them.
+
+    With limits, traversal stops early: directories at the maximum depth or
+    found after the total entry budget ran out are only counted, and
+    entries beyond the per-directory limit are not descended into. Each
+    such directory records the number of entries left out in its elided
+    attribute. With a total limit the tree is scanned breadth-first, so the
+    budget is spent on the top levels first.
+
+    With gitignore, entries ignored by the .gitignore and .ignore files of
+    their directory and its ancestors are dropped as well. Listings are
+    then not cached, since ignore files can change without changing the
+    mtime of the directories they apply to.
+
+    Args:
+        path (str): Directory path to scan
+        exclude_patterns (list): Patterns to exclude
+        logger (logging.Logger): Logger for debug information
+        cache (ScanCache): Persistent cache of directory listings, if any
+        profiler (Profiler): Profiler recording listing times and counts, if any
+        limits (ScanLimits): Traversal limits, unlimited if None
+        gitignore (GitignoreRules): Ignore rules of the tree, if any
+
+    Returns:
+        ScanNode: Root node of the scanned tree
+    """
+    max_depth, max_entries, remaining = limits if limits is not None else (None, None, None)
+    root = ScanNode(os.path.basename(os.path.normpath(path)), path, True)
+    pending = deque([(root, 0)])
+    next_node = pending.popleft if remaining is not None else pending.pop
+    if gitignore is not None:
+        cache = None
+
+    while pending:
+        node, depth = next_node()
+
+        if (max_depth is not None and depth >= max_depth) or remaining == 0:
+            node.elided = count_directory_entries(node.path, exclude_patterns, logger, gitignore) or 0
+            continue
+
+        entries = None
+        if cache is not None:
+            mtime_ns = cache.stat_directory(node.path)
+            entries = cache.get_listing(node.path, mtime_ns)
+        if entries is None:
+            if profiler is not None:
+                started = time.perf_counter()
+            entries = list_directory(node.path, exclude_patterns, logger, gitignore)
+            if profiler is not None:
+                profiler.record_listing(node.path, time.perf_counter() - started)
+            if entries is None:
+                continue
+            if cache is not None:
+                cache.put_listing(node.path, mtime_ns, entries)
+        elif profiler is not None:
+            profiler.count("listing_cache_hits")
+
+        if max_entries is not None and len(entries) > max_entries:
+            node.elided = len(entries) - max_entries
+            entries = entries[:max_entries]
+        if remaining is not None:
+            if len(entries) > remaining:
+                node.elided += len(entries) - remaining
+                entries = entries[:remaining]
+            remaining -= len(entries)
+
+        for name, is_dir, descend in entries:
+            child = ScanNode(name, os.path.join(node.path, name), is_dir)
+            node.children.append(child)
+            if descend:
+                pending.append((child, depth + 1))
+
+        if logger:
+            logger.debug(f"Scanned {node.path}")
+
+    return root
+
+def scan_directory_tree_parallel(path, exclude_patterns, workers, logger=None, gitignore=None):
+    """
+    Scan a directory tree with a process pool, sharding subtrees across workers.
+
+    The top of the tree is listed breadth-first in this process until there
+    are several subtrees per worker; each subtree is then scanned in a worker
+    and merged back in place. The resulting tree is identical to the one
+    produced by scan_directory_tree.
+
+    Args:
+        path (str): Directory path to scan
+        exclude_patterns (list): Patterns to exclude
+        workers (int): Number of worker processes
+        logger (logging.Logger): Logger for debug information
+        gitignore (GitignoreRules): Ignore rules of the tree, if any
+
+    Returns:
+        ScanNode: Root node of the scanned tree
+    """
+    root = ScanNode(os.path.basename(os.path.normpath(path)), path, True)
+    target_shards = workers * 4
+    frontier = deque([root])
+
+    while frontier and len(frontier) < target_shards:
+        node = frontier.popleft()
+        entries = list_directory(node.path, exclude_patterns, logger, gitignore)
+        if entries is None:
+            continue
+        for name, is_dir, descend in entries:
+            child = ScanNode(name, os.path.join(node.path, name), is_dir)
+            node.children.append(child)
+            if descend:
+                frontier.append(child)
+    shards = list(frontier)
+
+    if logger:
+        logger.info(f"Scanning {len(shards)} subtrees with {workers} worker processes")
+
+    if shards:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            fragments = executor.map(_scan_fragment, [node.path for node in shards], [exclude_patterns] * len(shards), [gitignore] * len(shards))
+            for node, fragment in zip(shards, fragments):
+                _decode_fragment(node, fragment)
+
+    return root
+
+def _scan_fragment(path, exclude_patterns, gitignore=None):
+    """
+    Scan a subtree in a worker process and encode it compactly.
+
+    Args:
+        path (str): Directory path of the subtree
+        exclude_patterns (list): Patterns to exclude
+        gitignore (GitignoreRules): Ignore rules of the tree, if any
+
+    Returns:
+        list: Tuples (depth, name, is_dir) in pre-order, depth 0 being the children of path
+    """
+    subtree = scan_directory_tree(path, exclude_patterns, logging.getLogger(__name__), gitignore=gitignore)
+
+    fragment = []
+    stack = [(child, 0) for child in reversed(subtree.children)]
+    while stack:
+        node, depth = stack.pop()
+        fragment.append((depth, node.name, node.is_dir))
+        if node.is_dir:
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+    return fragment
+
+def _decode_fragment(node, fragment):
+    """
+    Attach an encoded subtree produced by _scan_fragment below node.
+
+    Args:
+        node (ScanNode): Directory node the fragment was scanned from
+        fragment (list): Tuples (depth, name, is_dir) in pre-order
+    """
+    parents = [node]
+    for depth, name, is_dir in fragment:
+        del parents[depth + 1:]
+        parent = parents[depth]
+        child = ScanNode(name, os.path.join(parent.path, name), is_dir)
+        parent.children.append(child)
+        if is_dir:
+            parents.append(child)
+
+def list_directory(path, exclude_patterns, logger=None, gitignore=None):
+    """
+    List a single directory with os.scandir, dropping excluded and ignored entries.
+
+    Args:
+        path (str): Directory path to list
+        exclude_patterns (list): Patterns to exclude
+        logger (logging.Logger): Logger for debug information
+        gitignore (GitignoreRules): Ignore rules of the tree, if any
+
+    Returns:
+        list: Tuples (name, is_dir, descend) sorted by name, None if the directory cannot be listed
+    """
+    try:
+        with os.scandir(path) as it:
+            dir_entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        if logger:
+            logger.error(f"Cannot list directory {path}: {e}")
+        return None
+
+    ignore = gitignore.for_directory(path) if gitignore is not None else None
+    entries = []
+    for entry in dir_entries:
+        if match_pattern(exclude_patterns, entry.path):
+            if logger:
+                logger.debug(f"Excluded {entry.path}")
+            continue
+
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if ignore is not None and ignore.is_ignored(entry.path, is_dir):
+            if logger:
+                logger.debug(f"Ignored {entry.path}")
+            continue
+
+        entries.append((entry.name, is_dir, is_dir and not entry.is_symlink()))
+
+    return entries
+
+def count_directory_entries(path, exclude_patterns, logger=None, gitignore=None):
+    """
+    Count the entries of a directory that are not excluded, without sorting or stat'ing them.
+
+    Args:
+        path (str): Directory path to count
+        exclude_patterns (list): Patterns to exclude
+        logger (logging.Logger): Logger for debug information
+        gitignore (GitignoreRules): Ignore rules of the tree, if any
+
+    Returns:
+        int: Number of entries, None if the directory cannot be listed
+    """
+    ignore = gitignore.for_directory(path) if gitignore is not None else None
+    try:
+        with os.scandir(path) as it:
+            if ignore is not None:
+                return sum(1 for entry in it if not match_pattern(exclude_patterns, entry.path) and not ignore.is_ignored(entry.path, _is_dir(entry)))
+            return sum(1 for entry in it if not match_pattern(exclude_patterns, entry.path))
+    except OSError as e:
+        if logger:
+            logger.error(f"Cannot list directory {path}: {e}")
+        return None
+
+def _is_dir(entry):
+    """Check if a directory entry is a directory, treating unreadable entries as files."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+def iter_tree_nodes(root):
+    """
+    Iterate over all nodes below root in pre-order (root itself excluded).
+
+    Args:
+        root (ScanNode): Root node of the scanned tree
+
+    Yields:
+        ScanNode: Each directory and file node
+    """
+    stack = list(reversed(root.children))
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.is_dir:
+            stack.extend(reversed(node.children))
+
+def iter_tree_depths(root):
+    """
+    Iterate over all nodes below root in pre-order together with their depth.
+
+    Args:
+        root (ScanNode): Root node of the scanned tree
+
+    Yields:
+        tuple: (ScanNode, depth), depth 0 being the children of root
+    """
+    stack = [(child, 0) for child in reversed(root.children)]
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+        if node.is_dir:
+            stack.extend((child, depth + 1) for child in reversed(node.children))
@@ -0,0 +1,567 @@
+"""
+Watch mode: keep a scanned tree up to date and report changes incrementally.
+
+A LiveTree holds the scanned tree together with per-directory file counts
+and per-file content records. Change notifications only re-list the
+directories and re-read the files they name, and counts are adjusted along
+the path to the root, so a single edit costs a few syscalls instead of a
+full rescan.
+
+Changes come from inotify on Linux; elsewhere, or when inotify cannot be
+used, directory and content file mtimes are polled.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from collections import namedtuple
+from utils.file_utils import match_pattern
+from processors.scan_processor import ScanNode, scan_directory_tree, list_directory, iter_tree_nodes
+from processors.file_processor import compute_directory_file_counts
+from processors.content_processor import find_matching_files, iter_file_blocks
+
+# Result of LiveTree.refresh:
+#   added, removed: top nodes of added and removed subtrees
+#   counts: directory paths whose file counts changed
+#   files: content file paths whose records were added or updated
+#   added_dirs, removed_dirs: listed directories that appeared or disappeared
+#   removed_files: content file paths that disappeared
+TreeChanges = namedtuple("TreeChanges", ["added", "removed", "counts", "files", "added_dirs", "removed_dirs", "removed_files"])
+
+class LiveTree:
+    """
+    A scanned tree kept up to date from change notifications.
+
+    Args:
+        tree (ScanNode): Root node of the scanned tree
+        exclude_patterns (PatternSet): Compiled exclude patterns
+        file_patterns (PatternSet): Compiled file name patterns of content files
+        line_filter (LineFilter): Compiled filter for lines to exclude
+        read_content (bool): Whether content records are kept
+        logger (logging.Logger): Logger for debug information
+        jobs (int): Number of threads reading files concurrently
+        cache (ScanCache): Persistent cache used for the initial content read, if any
+        max_file_size (int): Files larger than this many bytes are skipped, no limit if None
+        mmap_threshold (int): Files of at least this many bytes are read through a memory map, never if None
+        profiler (Profiler): Profiler recording the initial content read, if any
+        gitignore (GitignoreRules): Ignore rules the tree was scanned with, if any
+        ignored_paths (iterable): Files written by the run itself (report, log, statistics),
+            left out of the tree so writing them never triggers a refresh
+    """
+
+    def __init__(self, tree, exclude_patterns, file_patterns, line_filter, read_content=True, logger=None, jobs=1,
+                 cache=None, max_file_size=None, mmap_threshold=None, profiler=None, gitignore=None, ignored_paths=()):
+        self.tree = tree
+        self.base_path = tree.path
+        self.exclude_patterns = exclude_patterns
+        self.gitignore = gitignore
+        self.file_patterns = file_patterns
+        self.line_filter = line_filter
+        self.read_content = read_content and bool(file_patterns)
+        self.logger = logger
+        self.jobs = jobs
+        self.max_file_size = max_file_size
+        self.mmap_threshold = mmap_threshold
+        self.ignored_paths = frozenset(os.path.abspath(path) for path in ignored_paths)
+        self._ignored_names = frozenset(os.path.basename(path) for path in self.ignored_paths)
+        self._prune_ignored(tree)
+
+        # Listed directories and their parents, for walking counts up to the root
+        self.dirs = {}
+        self.parents = {}
+        self._index(tree, None)
+
+        self.counts = compute_directory_file_counts(tree)
+        self.count_total = sum(recursive for path, (_, recursive) in self.counts.items() if path != tree.path)
+
+        # Content records (block, FileStats or None, content or None, skip reason or None) of every content file
+        self.file_records = {}
+        self.content_total = 0
+        self.chars_total = 0
+        if self.read_content:
+            matching_files = find_matching_files(tree, self.base_path, file_patterns)
+            file_blocks = iter_file_blocks(matching_files, line_filter, logger, jobs, cache, max_file_size, mmap_threshold, profiler)
+            for (file_path, _), result in zip(matching_files, file_blocks):
+                self._set_record(file_path, result)
+
+    def _is_ignored_path(self, path):
+        return os.path.basename(path) in self._ignored_names and os.path.abspath(path) in self.ignored_paths
+
+    def _prune_ignored(self, node):
+        """Remove the files written by the run itself from a subtree."""
+        if not self.ignored_paths or not node.is_dir:
+            return
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.children = [child for child in current.children if not self._is_ignored_path(child.path)]
+            stack.extend(child for child in current.children if child.is_dir)
+
+    def _is_content_file(self, node):
+        return self.read_content and not node.is_dir and match_pattern(self.file_patterns, node.name)
+
+    def _index(self, node, parent_path):
+        """
+        Register the listed directories of a subtree.
+
+        Directories without children are checked for being symlinks, which
+        are kept as entries but never listed.
+
+        Returns:
+            list: Paths of the listed directories
+        """
+        listed = []
+        stack = [(node, parent_path)]
+        while stack:
+            current, parent = stack.pop()
+            if not current.is_dir:
+                continue
+            if current is self.tree or current.children or not os.path.islink(current.path):
+                self.dirs[current.path] = current
+                self.parents[current.path] = parent
+                listed.append(current.path)
+                stack.extend((child, current.path) for child in current.children)
+        return listed
+
+    def _set_count(self, path, direct, recursive, changed):
+        previous = self.counts.get(path)
+        if path != self.tree.path:
+            self.count_total += recursive - (previous[1] if previous else 0)
+        self.counts[path] = (direct, recursive)
+        changed.add(path)
+
+    def _propagate(self, path, delta, changed):
+        """Add delta to the recursive count of every ancestor of path."""
+        parent = self.parents.get(path)
+        while parent is not None and delta:
+            direct, recursive = self.counts[parent]
+            self._set_count(parent, direct, recursive + delta, changed)
+            parent = self.parents.get(parent)
+
+    def _set_record(self, file_path, result):
+        self._drop_record(file_path)
+        self.file_records[file_path] = result
+        stats = result[1]
+        if stats is not None:
+            self.content_total += 1
+            self.chars_total += stats.char_count
+
+    def _drop_record(self, file_path):
+        previous = self.file_records.pop(file_path, None)
+        if previous is not None and previous[1] is not None:
+            self.content_total -= 1
+            self.chars_total -= previous[1].char_count
+
+    def _add(self, node, parent_path, changes, new_files, counts_changed):
+        """Register a new subtree: listed directories, counts and content files."""
+        changes.added.append(node)
+        changes.added_dirs.extend(self._index(node, parent_path))
+        if node.is_dir:
+            for path, (direct, recursive) in compute_directory_file_counts(node).items():
+                self._set_count(path, direct, recursive, counts_changed)
+        for current in [node] + list(iter_tree_nodes(node) if node.is_dir else []):
+            if self._is_content_file(current):
+                new_files.append(current.path)
+
+    def _drop(self, node, changes):
+        """Unregister a removed subtree."""
+        changes.removed.append(node)
+        for current in [node] + list(iter_tree_nodes(node) if node.is_dir else []):
+            if current.is_dir:
+                if self.dirs.pop(current.path, None) is not None:
+                    changes.removed_dirs.append(current.path)
+                self.parents.pop(current.path, None)
+                previous = self.counts.pop(current.path, None)
+                if previous is not None:
+                    self.count_total -= previous[1]
+            elif current.path in self.file_records:
+                self._drop_record(current.path)
+                changes.removed_files.append(current.path)
+
+    def _ignore_rule_changes(self, changed_dirs, changed_files):
+        """
+        Find the listed directories whose ignore files changed.
+
+        Returns:
+            list: Paths of the directories, their rules already invalidated
+        """
+        candidates = set(path for path in changed_dirs if path in self.dirs)
+        candidates.update(
+            os.path.dirname(path) for path in changed_files
+            if os.path.basename(path) in self.gitignore.file_names and os.path.dirname(path) in self.dirs
+        )
+        stale = [path for path in sorted(candidates, key=len) if self.gitignore.is_stale(path)]
+        for path in stale:
+            if self.logger:
+                self.logger.info(f"Ignore rules changed in {path}, re-listing the directories below it")
+            self.gitignore.invalidate(path)
+        return stale
+
+    def refresh(self, changed_dirs, changed_files):
+        """
+        Apply change notifications to the tree, counts and content records.
+
+        When the ignore files of a directory changed, every listed directory
+        below it is re-listed with the new rules.
+
+        Args:
+            changed_dirs (iterable): Directory paths whose entries may have changed
+            changed_files (iterable): File paths whose content may have changed
+
+        Returns:
+            TreeChanges: What changed
+        """
+        changes = TreeChanges([], [], [], [], [], [], [])
+        counts_changed = set()
+        new_files = []
+
+        if self.gitignore is not None:
+            stale = self._ignore_rule_changes(changed_dirs, changed_files)
+            if stale:
+                prefixes = tuple(os.path.join(path, '') for path in stale)
+                changed_dirs = set(changed_dirs)
+                changed_dirs.update(path for path in self.dirs if path in stale or path.startswith(prefixes))
+
+        # Parents before children, so directories removed with their parent are skipped
+        for dir_path in sorted(changed_dirs, key=len):
+            node = self.dirs.get(dir_path)
+            if node is None:
+                continue
+            entries = list_directory(dir_path, self.exclude_patterns, self.logger, self.gitignore)
+            if entries is None:
+                continue
+
+            old_children = {child.name: child for child in node.children}
+            children = []
+            for name, is_dir, descend in entries:
+                if name in self._ignored_names and self._is_ignored_path(os.path.join(dir_path, name)):
+                    continue
+                child = old_children.pop(name, None)
+                if child is not None and child.is_dir == is_dir and (child.path in self.dirs) == descend:
+                    children.append(child)
+                    continue
+                if child is not None:
+                    self._drop(child, changes)
+
+                child = ScanNode(name, os.path.join(dir_path, name), is_dir)
+                if descend:
+                    child.children = scan_directory_tree(child.path, self.exclude_patterns, self.logger, gitignore=self.gitignore).children
+                    self._prune_ignored(child)
+                children.append(child)
+                self._add(child, dir_path, changes, new_files, counts_changed)
+            for child in old_children.values():
+                self._drop(child, changes)
+            node.children = children
+
+            previous = self.counts[dir_path][1]
+            direct = sum(1 for child in children if not child.is_dir)
+            recursive = direct + sum(self.counts[child.path][1] for child in children if child.is_dir)
+            if (direct, recursive) != self.counts[dir_path]:
+                self._set_count(dir_path, direct, recursive, counts_changed)
+                self._propagate(dir_path, recursive - previous, counts_changed)
+
+        # Read new content files and content files that changed in place
+        updated = set(new_files)
+        updated.update(path for path in changed_files if path in self.file_records)
+        if updated:
+            matching_files = [(path, os.path.relpath(path, self.base_path)) for path in sorted(updated)]
+            file_blocks = iter_file_blocks(matching_files, self.line_filter, self.logger, self.jobs, None, self.max_file_size, self.mmap_threshold)
+            for (file_path, _), result in zip(matching_files, file_blocks):
+                self._set_record(file_path, result)
+                changes.files.append(file_path)
+
+        changes.counts.extend(sorted(path for path in counts_changed if path in self.counts))
+        return changes
+
+    def content_files(self):
+        """Get the paths of all content files."""
+        return list(self.file_records)
+
+class InotifyWatcher:
+    """
+    Change notifications from Linux inotify, through ctypes.
+
+    Every listed directory gets its own watch; entry changes mark the
+    directory, content writes mark the file.
+    """
+
+    _IN_MODIFY = 0x00000002
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_FROM = 0x00000040
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_DELETE = 0x00000200
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_IGNORED = 0x00008000
+    _IN_ONLYDIR = 0x01000000
+    _IN_DONT_FOLLOW = 0x02000000
+    _IN_ISDIR = 0x40000000
+    _IN_NONBLOCK = os.O_NONBLOCK
+    _IN_CLOEXEC = 0o2000000
+
+    _ENTRY_EVENTS = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+    _CONTENT_EVENTS = _IN_MODIFY | _IN_CLOSE_WRITE
+    _REPLACE_EVENTS = _IN_CREATE | _IN_MOVED_TO
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, logger=None):
+        self.logger = logger
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._paths = {}
+        self._wds = {}
+
+    def watch_directory(self, path):
+        """
+        Watch a directory for entry and content changes.
+
+        Raises:
+            OSError: If the watch limit is reached; other errors are logged and ignored
+        """
+        mask = self._ENTRY_EVENTS | self._CONTENT_EVENTS | self._IN_ONLYDIR | self._IN_DONT_FOLLOW
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOSPC, errno.ENOMEM):
+                raise OSError(error, os.strerror(error), path)
+            if self.logger:
+                self.logger.debug(f"Cannot watch {path}: {os.strerror(error)}")
+            return
+        self._paths[wd] = path
+        self._wds[path] = wd
+
+    def unwatch_directory(self, path):
+        wd = self._wds.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def watch_file(self, path):
+        pass
+
+    def unwatch_file(self, path):
+        pass
+
+    def read_events(self, timeout=None):
+        """
+        Wait for changes.
+
+        Args:
+            timeout (float): Seconds to wait, forever if None
+
+        Returns:
+            tuple: (changed directory paths, changed file paths, whether events were lost)
+        """
+        dirs = set()
+        files = set()
+        overflow = False
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return dirs, files, overflow
+
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                name = data[offset + self._EVENT.size:offset + self._EVENT.size + length].rstrip(b"\0")
+                offset += self._EVENT.size + length
+
+                if mask & self._IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                dir_path = self._paths.get(wd)
+                if dir_path is None:
+                    continue
+                if mask & self._IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    if self._wds.get(dir_path) == wd:
+                        del self._wds[dir_path]
+                elif mask & self._ENTRY_EVENTS:
+                    dirs.add(dir_path)
+                    # A file replaced by rename keeps its entry, so its content is marked too
+                    if mask & self._REPLACE_EVENTS and not mask & self._IN_ISDIR:
+                        files.add(os.path.join(dir_path, os.fsdecode(name)))
+                elif mask & self._CONTENT_EVENTS and not mask & self._IN_ISDIR:
+                    files.add(os.path.join(dir_path, os.fsdecode(name)))
+        return dirs, files, overflow
+
+    def close(self):
+        os.close(self._fd)
+
+class PollingWatcher:
+    """
+    Change notifications from polling directory and content file mtimes.
+
+    Args:
+        interval (float): Seconds between polls
+    """
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self._dirs = {}
+        self._files = {}
+        self._next_poll = time.monotonic() + interval
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def watch_directory(self, path):
+        self._dirs[path] = self._stamp(path)
+
+    def unwatch_directory(self, path):
+        self._dirs.pop(path, None)
+
+    def watch_file(self, path):
+        self._files[path] = self._stamp(path)
+
+    def unwatch_file(self, path):
+        self._files.pop(path, None)
+
+    def read_events(self, timeout=None):
+        """
+        Wait for the next poll, or until the timeout if that is sooner.
+
+        Args:
+            timeout (float): Seconds to wait, until the next poll if None
+
+        Returns:
+            tuple: (changed directory paths, changed file paths, False)
+        """
+        remaining = self._next_poll - time.monotonic()
+        if timeout is not None and timeout < remaining:
+            time.sleep(max(timeout, 0))
+            return set(), set(), False
+        time.sleep(max(remaining, 0))
+        self._next_poll = time.monotonic() + self.interval
+
+        changed = []
+        for stamps in (self._dirs, self._files):
+            paths = set()
+            for path, stamp in stamps.items():
+                current = self._stamp(path)
+                if current != stamp:
+                    stamps[path] = current
+                    paths.add(path)
+            changed.append(paths)
+        return changed[0], changed[1], False
+
+    def close(self):
+        pass
+
+def create_watcher(live, poll_interval=2.0, logger=None):
+    """
+    Create a watcher for every listed directory and content file of a tree.
+
+    inotify is used on Linux; if it is unavailable or runs out of watches,
+    mtimes are polled instead.
+
+    Args:
+        live (LiveTree): Tree to watch
+        poll_interval (float): Seconds between polls when polling
+        logger (logging.Logger): Logger for debug information
+
+    Returns:
+        InotifyWatcher or PollingWatcher: Watcher
+    """
+    if sys.platform.startswith("linux"):
+        watcher = None
+        try:
+            watcher = InotifyWatcher(logger)
+            for path in live.dirs:
+                watcher.watch_directory(path)
+            if logger:
+                logger.info(f"Watching {len(live.dirs)} directories with inotify")
+            return watcher
+        except (OSError, AttributeError) as e:
+            if watcher is not None:
+                watcher.close()
+            if logger:
+                logger.warning(f"Cannot use inotify, polling for changes instead: {e}")
+
+    watcher = PollingWatcher(poll_interval)
+    for path in live.dirs:
+        watcher.watch_directory(path)
+    for path in live.content_files():
+        watcher.watch_file(path)
+    if logger:
+        logger.info(f"Polling {len(live.dirs)} directories every {poll_interval}s")
+    return watcher
+
+def watch_changes(live, watcher, debounce=0.5, logger=None):
+    """
+    Apply changes to a LiveTree as they happen, yielding each debounced batch.
+
+    A batch is applied once no new change arrived for debounce seconds, or
+    after at most ten times that while changes keep coming.
+
+    Args:
+        live (LiveTree): Tree to keep up to date
+        watcher (InotifyWatcher or PollingWatcher): Source of change notifications
+        debounce (float): Quiet period in seconds before a batch is applied
+        logger (logging.Logger): Logger for debug information
+
+    Yields:
+        TreeChanges: Changes of each batch that changed anything
+    """
+    while True:
+        dirs, files, overflow = watcher.read_events()
+        if not (dirs or files or overflow):
+            continue
+
+        started = time.monotonic()
+        quiet_until = started + debounce
+        while True:
+            remaining = min(quiet_until, started + debounce * 10) - time.monotonic()
+            if remaining <= 0:
+                break
+            more_dirs, more_files, more_overflow = watcher.read_events(remaining)
+            if more_dirs or more_files or more_overflow:
+                dirs |= more_dirs
+                files |= more_files
+                overflow = overflow or more_overflow
+                quiet_until = time.monotonic() + debounce
+
+        if overflow:
+            if logger:
+                logger.warning("Change notifications were lost, refreshing every directory")
+            dirs = set(live.dirs)
+            files = set(live.content_files())
+
+        changes = live.refresh(dirs, files)
+
+        for path in changes.removed_dirs:
+            watcher.unwatch_directory(path)
+        for path in changes.removed_files:
+            watcher.unwatch_file(path)
+        for path in changes.added_dirs:
+            try:
+                watcher.watch_directory(path)
+            except OSError as e:
+                if logger:
+                    logger.warning(f"Changes below {path} will not be seen: {e}")
+        for path in changes.files:
+            watcher.watch_file(path)
+
+        if changes.added or changes.removed or changes.counts or changes.files:
+            if logger:
+                logger.info(
+                    f"Applied changes: {len(changes.added)} added, {len(changes.removed)} removed, "
+                    f"{len(changes.files)} files updated, {len(changes.counts)} counts updated"
+                )
+            yield changes
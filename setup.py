@@ -4,9 +4,7 @@ setup(
     name="dirstructure",
     version="1.0.0",
     packages=find_packages(),
-    install_requires=[
-        "prettytable>=2.0.0",
-    ],
+    install_requires=[],
     entry_points={
         "console_scripts": [
             "dirstructure=dirstructure.main:main",
@@ -0,0 +1,95 @@
+"""
+Regression tests for --respect-gitignore rule matching.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from utils.file_utils import PatternSet
+from utils.gitignore_utils import GitignoreRules
+from processors.scan_processor import scan_directory_tree, iter_tree_nodes
+
+FILES = [
+    "a.log", "b.txt", "keep.log", "logs/today.log", "logs/important.log",
+    "build/x.o", "src/build/z.txt", "src/main.py", "src/gen/out.py",
+    "gen/out.py", "gen/keep.py",
+    "docs/a.md", "docs/x/r.md", "docs/sub/deep/c.txt", "a/b/c/z.log",
+    "foo/bar/baz.txt", "foo/qux.txt", "x/foo/bar/q.txt",
+    "tmp/a", "tmp/b/c",
+    "vendor/pkg/a.py", "vendor/pkg/b.py",
+    "data1.csv", "dataX.csv",
+    "nested/.gitignore", "nested/a.tmp", "nested/inner/c.tmp", "nested/inner/keep.tmp",
+    "nested/anch.txt", "nested/inner/anch.txt",
+]
+
+ROOT_RULES = """\
+# comment
+*.log
+!important.log
+!keep.log
+/build/
+gen/*
+!gen/keep.py
+docs/**/*.md
+!docs/a.md
+**/foo/bar
+tmp/**
+vendor/pkg/
+!vendor/pkg/b.py
+data[0-9].csv
+"""
+
+NESTED_RULES = """\
+*.tmp
+!inner/keep.tmp
+/anch.txt
+"""
+
+EXPECTED = sorted([
+    ".gitignore", "b.txt", "keep.log", "logs/important.log",
+    "src/build/z.txt", "src/main.py", "src/gen/out.py", "gen/keep.py",
+    "docs/a.md", "docs/sub/deep/c.txt", "foo/qux.txt", "dataX.csv",
+    "nested/.gitignore", "nested/inner/keep.tmp", "nested/inner/anch.txt",
+])
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / ".gitignore").write_text(ROOT_RULES)
+    (tmp_path / "nested" / ".gitignore").write_text(NESTED_RULES)
+    return tmp_path
+
+def scanned_files(root):
+    tree = scan_directory_tree(root, PatternSet([".git"]), gitignore=GitignoreRules(root))
+    return sorted(os.path.relpath(node.path, root).replace(os.sep, "/") for node in iter_tree_nodes(tree) if not node.is_dir)
+
+def test_absolute_root(tree):
+    assert scanned_files(str(tree)) == EXPECTED
+
+def test_relative_root(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    assert scanned_files(".") == EXPECTED
+
+def test_relative_root_below_cwd(tree, monkeypatch):
+    monkeypatch.chdir(tree.parent)
+    assert scanned_files(os.path.join(".", tree.name)) == EXPECTED
+
+def test_sibling_with_common_prefix_is_not_below_root(tmp_path):
+    rules = GitignoreRules(str(tmp_path / "a" / "b"))
+    assert rules._is_within_root(str(tmp_path / "a" / "b" / "c"))
+    assert not rules._is_within_root(str(tmp_path / "a" / "bc"))
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_matches_git(tree):
+    subprocess.run(["git", "init", "-q", str(tree)], check=True)
+    output = subprocess.check_output(["git", "ls-files", "--others", "--exclude-standard"], cwd=str(tree))
+    assert scanned_files(str(tree)) == sorted(output.decode("utf-8").splitlines())
@@ -0,0 +1,260 @@
+"""
+Persistent scan cache utilities for directory structure analysis.
+
+The cache is an SQLite file per analyzed root. It keeps each directory's
+filtered listing keyed on the directory mtime and each content file's
+read result keyed on mtime/size/inode, so later runs only re-list
+changed directories and only reread changed files.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+
+CACHE_VERSION = 1
+
+# Entries modified this recently are not cached: a change within the same
+# mtime tick after the scan would otherwise go unnoticed on the next run.
+RACY_WINDOW_NS = 2 * 10**9
+
+# Rows not used by this many consecutive runs are evicted.
+STALE_RUNS = 10
+
+class ScanCache:
+    """
+    SQLite-backed cache of directory listings and file read results.
+
+    Args:
+        cache_dir (str): Directory holding the cache files
+        root_path (str): Analyzed root path, one cache file per root
+        settings (dict): Settings the cached data depends on; any change clears the cache
+        max_bytes (int): Upper bound for cached payload size before eviction
+        logger (logging.Logger): Logger for debug information
+    """
+
+    def __init__(self, cache_dir, root_path, settings, max_bytes=256 * 1024 * 1024, logger=None):
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self._used_dirs = []
+        self._used_files = []
+
+        os.makedirs(cache_dir, exist_ok=True)
+        root_key = hashlib.sha1(os.path.abspath(root_path).encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, f"scan_cache_{root_key}.sqlite3")
+
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS dirs (
+                path BLOB PRIMARY KEY,
+                mtime_ns INTEGER,
+                entries BLOB,
+                size INTEGER,
+                last_used INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path BLOB PRIMARY KEY,
+                mtime_ns INTEGER,
+                file_size INTEGER,
+                inode INTEGER,
+                char_count INTEGER,
+                line_count INTEGER,
+                filtered_line_count INTEGER,
+                content_hash TEXT,
+                content BLOB,
+                size INTEGER,
+                last_used INTEGER
+            );
+        """)
+
+        settings_key = hashlib.sha1(json.dumps([CACHE_VERSION, settings], sort_keys=True).encode('utf-8')).hexdigest()
+        if self._get_meta("settings_key") != settings_key:
+            if logger:
+                logger.info(f"Cache settings changed, clearing {self.path}")
+            self._db.execute("DELETE FROM dirs")
+            self._db.execute("DELETE FROM files")
+            self._set_meta("settings_key", settings_key)
+
+        self.run_id = int(self._get_meta("run_id") or 0) + 1
+        self._set_meta("run_id", str(self.run_id))
+
+    def _get_meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @staticmethod
+    def _is_racy(mtime_ns):
+        return time.time() * 10**9 - mtime_ns < RACY_WINDOW_NS
+
+    @staticmethod
+    def _db_path(path):
+        # Paths are stored as bytes so undecodable file names round-trip
+        return os.fsencode(path)
+
+    def stat_directory(self, dir_path):
+        """
+        Get the modification time of a directory.
+
+        Args:
+            dir_path (str): Directory path
+
+        Returns:
+            int: Modification time in nanoseconds, None if the directory cannot be stat'ed
+        """
+        try:
+            return os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get_listing(self, dir_path, mtime_ns):
+        """
+        Get the cached listing of a directory if it has not changed.
+
+        Args:
+            dir_path (str): Directory path
+            mtime_ns (int): Current modification time of the directory
+
+        Returns:
+            list: Tuples (name, is_dir, descend), None if not cached or stale
+        """
+        if mtime_ns is None:
+            return None
+        key = self._db_path(dir_path)
+        row = self._db.execute("SELECT mtime_ns, entries FROM dirs WHERE path = ?", (key,)).fetchone()
+        if row is None or row[0] != mtime_ns:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used_dirs.append(key)
+        return [tuple(entry) for entry in json.loads(zlib.decompress(row[1]).decode('utf-8'))]
+
+    def put_listing(self, dir_path, mtime_ns, entries):
+        """
+        Store the listing of a directory.
+
+        Args:
+            dir_path (str): Directory path
+            mtime_ns (int): Modification time of the directory when it was listed
+            entries (list): Tuples (name, is_dir, descend)
+        """
+        if mtime_ns is None or self._is_racy(mtime_ns):
+            return
+        payload = zlib.compress(json.dumps(entries, separators=(',', ':')).encode('utf-8'))
+        self._db.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns, entries, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            (self._db_path(dir_path), mtime_ns, payload, len(payload), self.run_id),
+        )
+
+    def get_file(self, file_path, st):
+        """
+        Get the cached read result of a file if its metadata has not changed.
+
+        Args:
+            file_path (str): File path
+            st (os.stat_result): Current stat of the file
+
+        Returns:
+            tuple: (content, char_count, line_count, filtered_line_count), None if not cached or stale
+        """
+        key = self._db_path(file_path)
+        row = self._db.execute(
+            "SELECT mtime_ns, file_size, inode, char_count, line_count, filtered_line_count, content_hash, content "
+            "FROM files WHERE path = ?",
+            (key,),
+        ).fetchone()
+        if row is None or (row[0], row[1], row[2]) != (st.st_mtime_ns, st.st_size, st.st_ino):
+            self.misses += 1
+            return None
+
+        encoded = zlib.decompress(row[7])
+        if hashlib.sha1(encoded).hexdigest() != row[6]:
+            if self.logger:
+                self.logger.warning(f"Cache entry for {file_path} is corrupt, rereading")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used_files.append(key)
+        return encoded.decode('utf-8'), row[3], row[4], row[5]
+
+    def put_file(self, file_path, st, content, char_count, line_count, filtered_line_count):
+        """
+        Store the read result of a file.
+
+        Args:
+            file_path (str): File path
+            st (os.stat_result): Stat of the file taken before it was read
+            content (str): Filtered file content
+            char_count (int): Character count of the unfiltered file
+            line_count (int): Line count of the unfiltered file
+            filtered_line_count (int): Line count after filtering
+        """
+        if self._is_racy(st.st_mtime_ns):
+            return
+        encoded = content.encode('utf-8')
+        payload = zlib.compress(encoded)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, file_size, inode, char_count, line_count, "
+            "filtered_line_count, content_hash, content, size, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self._db_path(file_path), st.st_mtime_ns, st.st_size, st.st_ino, char_count, line_count,
+                filtered_line_count, hashlib.sha1(encoded).hexdigest(), payload, len(payload), self.run_id,
+            ),
+        )
+
+    def _evict(self):
+        """Drop rows unused for STALE_RUNS runs, then the oldest rows until under max_bytes."""
+        stale_before = self.run_id - STALE_RUNS
+        self._db.execute("DELETE FROM dirs WHERE last_used < ?", (stale_before,))
+        self._db.execute("DELETE FROM files WHERE last_used < ?", (stale_before,))
+
+        total = self._db.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM dirs) + (SELECT COALESCE(SUM(size), 0) FROM files)"
+        ).fetchone()[0]
+        while total > self.max_bytes:
+            oldest = self._db.execute(
+                "SELECT MIN(last_used) FROM (SELECT last_used FROM dirs UNION ALL SELECT last_used FROM files)"
+            ).fetchone()[0]
+            if oldest is None:
+                break
+            if oldest == self.run_id:
+                # Everything left belongs to this run: trim the largest file payloads
+                rows = self._db.execute("SELECT path, size FROM files ORDER BY size DESC").fetchall()
+                for path, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+                    total -= size
+                break
+            freed = self._db.execute(
+                "SELECT (SELECT COALESCE(SUM(size), 0) FROM dirs WHERE last_used = ?) + "
+                "(SELECT COALESCE(SUM(size), 0) FROM files WHERE last_used = ?)",
+                (oldest, oldest),
+            ).fetchone()[0]
+            self._db.execute("DELETE FROM dirs WHERE last_used = ?", (oldest,))
+            self._db.execute("DELETE FROM files WHERE last_used = ?", (oldest,))
+            total -= freed
+
+    def close(self):
+        """Record which entries this run used, evict, and write the cache to disk."""
+        self._db.executemany("UPDATE dirs SET last_used = ? WHERE path = ?", ((self.run_id, path) for path in self._used_dirs))
+        self._db.executemany("UPDATE files SET last_used = ? WHERE path = ?", ((self.run_id, path) for path in self._used_files))
+        self._evict()
+        self._db.commit()
+        self._db.execute("PRAGMA incremental_vacuum")
+        self._db.close()
+
+        if self.logger:
+            self.logger.info(f"Scan cache {self.path}: {self.hits} hits, {self.misses} misses")
@@ -2,42 +2,101 @@
 Display utilities for directory structure analysis.
 """
 
-from prettytable import PrettyTable
+import heapq
+import unicodedata
 
-def create_directory_count_table(dir_file_count):
+def _text_width(text):
+    """Get the display width of text, counting wide characters twice and combining ones not at all."""
+    try:
+        text.encode('ascii')
+        return len(text)
+    except UnicodeEncodeError:
+        pass
+
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+    return width
+
+def write_table(out, headers, rows, align, chunk_rows=4096):
     """
-    Create a PrettyTable for directory file counts.
-    
+    Write rows as a bordered text table, in the same layout PrettyTable uses.
+
+    Column widths are computed in one pass over the rows, then the rows are
+    formatted and written in chunks without building the whole table. Like
+    str(PrettyTable), the output does not end with a newline.
+
     Args:
-        dir_file_count (list): List of tuples (directory_path, file_count)
-        
+        out (file-like): Stream the table is written to
+        headers (list): Column headers
+        rows (list): Row tuples, one value per column
+        align (list): Alignment per column, "l" or "r"
+        chunk_rows (int): Number of rows buffered per write
+    """
+    widths = [_text_width(header) for header in headers]
+    for row in rows:
+        for index, value in enumerate(row):
+            width = _text_width(str(value))
+            if width > widths[index]:
+                widths[index] = width
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+
+    def format_row(values):
+        cells = []
+        for value, width, column_align in zip(values, widths, align):
+            text = str(value)
+            padding = " " * (width - _text_width(text))
+            cells.append(" " + (padding + text if column_align == "r" else text + padding) + " ")
+        return "|" + "|".join(cells) + "|\n"
+
+    out.write(border + format_row(headers) + border)
+    lines = []
+    for row in rows:
+        lines.append(format_row(row))
+        if len(lines) >= chunk_rows:
+            out.write("".join(lines))
+            lines.clear()
+    lines.append(border[:-1])
+    out.write("".join(lines))
+
+def select_rows(rows, key, top=None):
+    """
+    Sort rows by key in descending order, keeping only the top rows if requested.
+
+    With top, a heap-based partial sort is used instead of sorting every row;
+    the result is the same as sorting and slicing.
+
+    Args:
+        rows (list): Row tuples
+        key (callable): Sort key of a row
+        top (int): Number of rows to keep, all rows if None
+
     Returns:
-        PrettyTable: Formatted table
+        list: Selected rows, largest first
+    """
+    if top is not None and top < len(rows):
+        return heapq.nlargest(top, rows, key=key)
+    return sorted(rows, key=key, reverse=True)
+
+def write_directory_count_table(out, dir_file_count):
+    """
+    Write a table of directory file counts.
+
+    Args:
+        out (file-like): Stream the table is written to
+        dir_file_count (list): List of tuples (directory_path, file_count)
     """
-    table = PrettyTable(["File Count", "Directory"])
-    table.align["File Count"] = "r"
-    table.align["Directory"] = "l"
-    
-    for dir_path, file_count in dir_file_count:
-        table.add_row([file_count, dir_path])
-        
-    return table
+    write_table(out, ["File Count", "Directory"], [(file_count, dir_path) for dir_path, file_count in dir_file_count], ["r", "l"])
 
-def create_character_count_table(file_char_counts):
+def write_character_count_table(out, file_char_counts):
     """
-    Create a PrettyTable for file character counts.
-    
+    Write a table of file character counts.
+
     Args:
+        out (file-like): Stream the table is written to
         file_char_counts (list): List of tuples (char_count, file_path)
-        
-    Returns:
-        PrettyTable: Formatted table
-    """
-    table = PrettyTable(["Character Count", "File Path"])
-    table.align["Character Count"] = "r"
-    table.align["File Path"] = "l"
-    
-    for char_count, file_path in file_char_counts:
-        table.add_row([char_count, file_path])
-        
-    return table
\ No newline at end of file
+    """
+    write_table(out, ["Character Count", "File Path"], file_char_counts, ["r", "l"])
@@ -3,8 +3,88 @@ File utility functions for directory structure analysis.
 """
 
 import os
+import re
+import codecs
 import fnmatch
 
+# Number of leading bytes inspected to tell text from binary files
+SNIFF_BLOCK_SIZE = 8192
+
+# Bytes expected in text: printable ASCII, common whitespace/control
+# characters (\b \t \n \f \r ESC) and everything above 0x7f.
+_TEXT_BYTES = bytes({8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7f)) | set(range(0x80, 0x100)))
+
+# Share of non-text bytes above which a block is considered binary
+_BINARY_RATIO = 0.3
+
+class PatternSet:
+    """
+    Compiled form of a pattern list with the same semantics as match_pattern.
+
+    Patterns without '*' are matched by exact basename, '*<suffix>' globs
+    by a single str.endswith over all suffixes, and the remaining globs by
+    one combined regular expression.
+
+    Args:
+        patterns (list): List of patterns to compile
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+
+        exact_names = set()
+        suffixes = []
+        globs = []
+        for pattern in self.patterns:
+            if '*' not in pattern:
+                exact_names.add(pattern)
+                continue
+
+            # fnmatch.fnmatch normalizes case (and separators) on both sides
+            normalized = os.path.normcase(pattern)
+            tail = normalized[1:]
+            if normalized.startswith('*') and not any(c in tail for c in '*?['):
+                suffixes.append(tail)
+            else:
+                globs.append(fnmatch.translate(normalized))
+
+        self.exact_names = frozenset(exact_names)
+        self.suffixes = tuple(suffixes)
+        self._glob_match = re.compile('|'.join(globs)).match if globs else None
+
+    def matches(self, name):
+        """
+        Check if file/directory name matches any pattern in the set.
+
+        Args:
+            name (str): File or directory name to check
+
+        Returns:
+            bool: True if name matches any pattern, False otherwise
+        """
+        if self.exact_names and os.path.basename(name) in self.exact_names:
+            return True
+        if self.suffixes or self._glob_match is not None:
+            normalized = os.path.normcase(name)
+            if self.suffixes and normalized.endswith(self.suffixes):
+                return True
+            if self._glob_match is not None and self._glob_match(normalized):
+                return True
+        return False
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __reduce__(self):
+        # Recompile on unpickling (e.g. in worker processes)
+        return (PatternSet, (self.patterns,))
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def __repr__(self):
+        return f"PatternSet({list(self.patterns)!r})"
+
 def match_pattern(patterns, name):
     """
     Check if file/directory name matches any of the given patterns.
@@ -12,12 +92,15 @@ def match_pattern(patterns, name):
     Otherwise, check for exact match.
     
     Args:
-        patterns (list): List of patterns to match against
+        patterns (list or PatternSet): List of patterns to match against
         name (str): File or directory name to check
         
     Returns:
         bool: True if name matches any pattern, False otherwise
     """
+    if isinstance(patterns, PatternSet):
+        return patterns.matches(name)
+
     for pattern in patterns:
         if '*' in pattern:
             if fnmatch.fnmatch(name, pattern):
@@ -25,4 +108,30 @@ def match_pattern(patterns, name):
         else:
             if os.path.basename(name) == pattern:
                 return True
-    return False
\ No newline at end of file
+    return False
+
+def is_binary_block(block):
+    """
+    Decide whether the leading block of a file looks like binary data.
+    
+    A block is binary if it contains a NUL byte, has a high share of
+    control bytes, or is not valid UTF-8 (a sequence cut off at the end
+    of the block is allowed).
+    
+    Args:
+        block (bytes): Leading bytes of the file
+        
+    Returns:
+        bool: True if the file should be treated as binary
+    """
+    if not block:
+        return False
+    if b'\x00' in block:
+        return True
+    if len(block.translate(None, _TEXT_BYTES)) / len(block) > _BINARY_RATIO:
+        return True
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(block, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
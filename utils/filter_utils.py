@@ -0,0 +1,166 @@
+"""
+Content filtering utilities for directory structure analysis.
+"""
+
+import re
+import mmap
+import codecs
+
+# Chunk size used when counting lines and characters of a mapped file
+_COUNT_CHUNK_SIZE = 1024 * 1024
+
+class LineFilter:
+    """
+    Precompiled matcher for lines containing any of the exclude strings.
+
+    All exclude strings are merged into one alternation regex, so a line is
+    checked with a single search instead of one substring test per string.
+
+    Args:
+        exclude_strings (list): Substrings to exclude lines containing them
+    """
+
+    def __init__(self, exclude_strings):
+        self.exclude_strings = tuple(exclude_strings)
+
+        strings = sorted(set(self.exclude_strings), key=len, reverse=True)
+        self._excludes_everything = '' in strings
+        # A match spanning a line break would drop the wrong line in
+        # whole-buffer mode, so such strings are only checked per line.
+        self._line_mode_only = any('\n' in s or '\r' in s for s in strings)
+        self._search = re.compile('|'.join(map(re.escape, strings))).search if strings else None
+        self._bytes_search = re.compile(b'|'.join(re.escape(s.encode('utf-8')) for s in strings)).search if strings else None
+
+    def __bool__(self):
+        return self._search is not None
+
+    def excludes(self, line):
+        """
+        Check if a line contains any of the exclude strings.
+
+        Args:
+            line (str): Line to check
+
+        Returns:
+            bool: True if the line should be excluded
+        """
+        return self._search is not None and self._search(line) is not None
+
+    def filter_text(self, text):
+        """
+        Drop every line containing an exclude string from a decoded text in bulk.
+
+        The text must use '\n' line breaks (as produced by text-mode reads).
+        The result matches filtering line by line and joining the kept lines
+        with '\n'.
+
+        Args:
+            text (str): Decoded file content
+
+        Returns:
+            tuple: (filtered content, original line count, filtered line count)
+        """
+        line_count = text.count('\n')
+        if text and not text.endswith('\n'):
+            line_count += 1
+
+        if self._excludes_everything:
+            return '', line_count, 0
+        if self._line_mode_only:
+            parts = text.split('\n')
+            lines = [part + '\n' for part in parts[:-1]]
+            if parts[-1]:
+                lines.append(parts[-1])
+            kept = [line.rstrip('\n') for line in lines if not self.excludes(line)]
+            return '\n'.join(kept), line_count, len(kept)
+
+        search = self._search
+        match = search(text) if search is not None else None
+        if match is None:
+            return (text[:-1] if text.endswith('\n') else text), line_count, line_count
+
+        kept = []
+        copied_to = 0
+        dropped = 0
+        while match is not None:
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            line_end = text.find('\n', match.start())
+            line_end = len(text) if line_end == -1 else line_end + 1
+
+            kept.append(text[copied_to:line_start])
+            copied_to = line_end
+            dropped += 1
+            match = search(text, line_end)
+        kept.append(text[copied_to:])
+
+        content = ''.join(kept)
+        if content.endswith('\n'):
+            content = content[:-1]
+        return content, line_count, line_count - dropped
+
+    def filter_mapped_file(self, f):
+        """
+        Filter a UTF-8 file through a memory map without decoding it as a whole.
+
+        Line boundaries and exclude-string matches are found on the raw
+        bytes, and only the kept spans are decoded for the content. The
+        whole file is still validated chunk by chunk with an incremental
+        decoder while lines and characters are counted, so dropped lines
+        with invalid UTF-8 fail the same way as on the text path. Files
+        containing '\r' are left to the text path, which applies universal
+        newline translation.
+
+        Args:
+            f (file): File opened in binary mode
+
+        Returns:
+            tuple: (filtered content, character count, original line count, filtered line count),
+                None if the file must be read through the text path instead
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        if self._line_mode_only:
+            return None
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            if mm.find(b'\r') != -1:
+                return None
+
+            line_count = 0
+            char_count = 0
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            for offset in range(0, size, _COUNT_CHUNK_SIZE):
+                chunk = mm[offset:offset + _COUNT_CHUNK_SIZE]
+                line_count += chunk.count(b'\n')
+                char_count += len(decoder.decode(chunk))
+            char_count += len(decoder.decode(b'', final=True))
+            if size and mm[size - 1] != 0x0a:
+                line_count += 1
+
+            if self._excludes_everything:
+                return '', char_count, line_count, 0
+
+            kept = []
+            copied_to = 0
+            dropped = 0
+            search = self._bytes_search
+            match = search(mm) if search is not None else None
+            while match is not None:
+                line_start = mm.rfind(b'\n', 0, match.start()) + 1
+                line_end = mm.find(b'\n', match.start())
+                line_end = size if line_end == -1 else line_end + 1
+
+                if line_start > copied_to:
+                    kept.append(mm[copied_to:line_start].decode('utf-8'))
+                copied_to = line_end
+                dropped += 1
+                match = search(mm, line_end)
+            if copied_to < size:
+                kept.append(mm[copied_to:size].decode('utf-8'))
+
+        content = ''.join(kept)
+        if content.endswith('\n'):
+            content = content[:-1]
+        return content, char_count, line_count, line_count - dropped
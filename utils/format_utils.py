@@ -0,0 +1,169 @@
+"""
+Machine-readable output formats for directory structure analysis.
+
+Both writers take a binary stream and write one record at a time, so
+reports can be produced and consumed incrementally.
+
+JSONL: one JSON object per line with a "type" key.
+
+Binary: a compact record stream. It starts with MAGIC and a length-prefixed
+JSON copy of RECORD_SCHEMAS, followed by records made of a one-byte type id
+(1-based index into RECORD_SCHEMAS) and the record's fields in schema order.
+Unsigned integers are LEB128 varints, booleans one byte, and strings a
+varint byte length followed by UTF-8.
+"""
+
+import json
+import struct
+from collections import OrderedDict
+
+MAGIC = b"DSTREE\x00\x01"
+
+RECORD_SCHEMAS = OrderedDict([
+    ("header", [("path", "str"), ("generated", "str"), ("display", "str")]),
+    # Pre-order tree nodes; depth 0 are the children of the root
+    ("node", [("depth", "uint"), ("is_dir", "bool"), ("name", "str")]),
+    ("file", [("path", "str"), ("lines", "uint"), ("original_lines", "uint"), ("chars", "uint"), ("bytes", "uint"), ("content", "str")]),
+    ("skipped_file", [("path", "str"), ("reason", "str")]),
+    ("count", [("path", "str"), ("direct", "uint"), ("file_count", "uint")]),
+    ("chars", [("path", "str"), ("char_count", "uint")]),
+    ("summary", [("section", "str"), ("total", "uint")]),
+    # Watch mode: an update record starts each batch of changes that follows
+    ("update", [("generated", "str"), ("changes", "uint")]),
+    ("added", [("path", "str"), ("is_dir", "bool")]),
+    ("removed", [("path", "str"), ("is_dir", "bool")]),
+    # Number of entries of a directory left out by scan limits
+    ("elided", [("path", "str"), ("count", "uint")]),
+])
+
+_TYPE_IDS = {name: index + 1 for index, name in enumerate(RECORD_SCHEMAS)}
+_BOOL = struct.Struct("?")
+
+def _encode_str(value):
+    # Undecodable file names survive as \udcxx escapes
+    return value.encode('utf-8', 'backslashreplace')
+
+def _encode_uint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+class JsonlWriter:
+    """
+    Write records as JSON lines.
+
+    Args:
+        out (file-like): Binary stream the records are written to
+    """
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, record_type, **fields):
+        """
+        Write a single record.
+
+        Args:
+            record_type (str): Record type, one of RECORD_SCHEMAS
+            **fields: Record fields
+        """
+        record = {"type": record_type}
+        record.update(fields)
+        self.out.write(_encode_str(json.dumps(record, ensure_ascii=False)) + b"\n")
+
+class BinaryWriter:
+    """
+    Write records in the compact binary format described in the module docstring.
+
+    Args:
+        out (file-like): Binary stream the records are written to
+    """
+
+    def __init__(self, out):
+        self.out = out
+        schema = json.dumps(RECORD_SCHEMAS, separators=(',', ':')).encode('utf-8')
+        self.out.write(MAGIC + _encode_uint(len(schema)) + schema)
+
+    def write(self, record_type, **fields):
+        """
+        Write a single record.
+
+        Args:
+            record_type (str): Record type, one of RECORD_SCHEMAS
+            **fields: Record fields; extra fields not in the schema are ignored
+        """
+        parts = [bytes((_TYPE_IDS[record_type],))]
+        for name, kind in RECORD_SCHEMAS[record_type]:
+            value = fields[name]
+            if kind == "uint":
+                parts.append(_encode_uint(value))
+            elif kind == "bool":
+                parts.append(_BOOL.pack(value))
+            else:
+                encoded = _encode_str(value)
+                parts.append(_encode_uint(len(encoded)))
+                parts.append(encoded)
+        self.out.write(b"".join(parts))
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated binary report")
+    return data
+
+def _read_uint(stream):
+    value = 0
+    shift = 0
+    while True:
+        byte = _read_exact(stream, 1)[0]
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value
+        shift += 7
+
+def read_binary_records(stream):
+    """
+    Read records written by BinaryWriter.
+
+    Args:
+        stream (file-like): Binary stream positioned at the start of the report
+
+    Yields:
+        dict: Record fields with a "type" key
+    """
+    if _read_exact(stream, len(MAGIC)) != MAGIC:
+        raise ValueError("Not a binary directory structure report")
+    schemas = list(json.loads(_read_exact(stream, _read_uint(stream)).decode('utf-8'), object_pairs_hook=OrderedDict).items())
+
+    while True:
+        type_byte = stream.read(1)
+        if not type_byte:
+            return
+        record_type, fields = schemas[type_byte[0] - 1]
+        record = {"type": record_type}
+        for name, kind in fields:
+            if kind == "uint":
+                record[name] = _read_uint(stream)
+            elif kind == "bool":
+                record[name] = _BOOL.unpack(_read_exact(stream, 1))[0]
+            else:
+                record[name] = _read_exact(stream, _read_uint(stream)).decode('utf-8')
+        yield record
+
+def create_record_writer(output_format, out):
+    """
+    Create the record writer for an output format.
+
+    Args:
+        output_format (str): "jsonl" or "binary"
+        out (file-like): Binary stream the records are written to
+
+    Returns:
+        JsonlWriter or BinaryWriter: Record writer
+    """
+    if output_format == "jsonl":
+        return JsonlWriter(out)
+    return BinaryWriter(out)
@@ -0,0 +1,331 @@
+"""
+Gitignore-style exclusion rules for directory structure analysis.
+
+Rules are read from .gitignore and .ignore files while the tree is
+scanned. Each directory's rules are compiled once and shared by all of its
+descendants; directories without ignore files reuse their parent's rules.
+Supported syntax follows gitignore: comments, negation with '!', patterns
+anchored by a '/', directory-only patterns ending in '/', '*', '?',
+character classes and '**'.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+# Ignore files read in every directory; rules of later files take precedence
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+
+# A single parsed rule; regex is the translated pattern without anchors
+IgnoreRule = namedtuple("IgnoreRule", ["pattern", "regex", "negated", "dir_only", "anchored"])
+
+def _translate(pattern):
+    """
+    Translate a gitignore glob into a regular expression.
+
+    '*' and '?' do not match '/', a leading '**/' matches any number of
+    leading directories, '/**/' zero or more directories in between and a
+    trailing '/**' everything inside.
+
+    Args:
+        pattern (str): Glob without negation, leading '/' or trailing '/'
+
+    Returns:
+        str: Regular expression matching the whole path
+    """
+    parts = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            j = i
+            while j < n and pattern[j] == '*':
+                j += 1
+            if j - i >= 2 and (i == 0 or pattern[i - 1] == '/') and (j == n or pattern[j] == '/'):
+                if j == n:
+                    parts.append('.*')
+                    i = j
+                else:
+                    parts.append('(?:.*/)?')
+                    i = j + 1
+                continue
+            parts.append('[^/]*')
+            i = j
+        elif c == '?':
+            parts.append('[^/]')
+            i += 1
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                parts.append('\\[')
+                i += 1
+                continue
+            body = pattern[i + 1:j]
+            if body[0] in '!^':
+                body = '^' + body[1:]
+            parts.append('[' + body.replace('\\', '\\\\') + ']')
+            i = j + 1
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(c))
+            i += 1
+    return ''.join(parts)
+
+def parse_ignore_lines(lines):
+    """
+    Parse the lines of an ignore file into rules.
+
+    Args:
+        lines (iterable): Lines of the file
+
+    Returns:
+        list: IgnoreRule records in file order
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line or line.startswith('#'):
+            continue
+
+        # Trailing spaces are dropped unless escaped with a backslash
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        line = stripped
+
+        pattern = line
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        if dir_only:
+            line = line[:-1]
+        if not line:
+            continue
+
+        # A slash anywhere but at the end anchors the pattern to the file's directory
+        anchored = '/' in line
+        if line.startswith('/'):
+            line = line[1:]
+        rules.append(IgnoreRule(pattern, _translate(line), negated, dir_only, anchored))
+    return rules
+
+class IgnoreMatcher:
+    """
+    Compiled rules of one directory level, chained to the rules of its parent.
+
+    Within a level the last matching rule decides; a level without a
+    matching rule defers to its parent. To decide with one search per
+    level, the rules are combined into alternations in reverse file order,
+    one for basename rules and one for anchored rules, separately for
+    files (which directory-only rules never match) and directories.
+
+    Args:
+        base_path (str): Directory the rules were read from
+        rules (list): IgnoreRule records in file order
+        parent (IgnoreMatcher): Rules of the enclosing directories, if any
+    """
+
+    def __init__(self, base_path, rules, parent=None):
+        self.base_path = base_path
+        self.rules = tuple(rules)
+        self.parent = parent
+        self._prefix_length = len(os.path.join(base_path, ''))
+        self._file_matchers = self._compile(dir_only_rules=False)
+        self._dir_matchers = self._compile(dir_only_rules=True)
+
+    def _compile(self, dir_only_rules):
+        matchers = []
+        for anchored in (False, True):
+            indexes = [
+                index for index in reversed(range(len(self.rules)))
+                if self.rules[index].anchored == anchored and (dir_only_rules or not self.rules[index].dir_only)
+            ]
+            if indexes:
+                # Translated rules only contain non-capturing groups, so group k is alternative k
+                regex = re.compile('(?:' + '|'.join(f'({self.rules[index].regex})' for index in indexes) + r')\Z', re.DOTALL)
+                matchers.append((anchored, regex.match, indexes))
+        return matchers
+
+    def _match_level(self, path, is_dir):
+        best = -1
+        for anchored, match, indexes in (self._dir_matchers if is_dir else self._file_matchers):
+            if anchored:
+                target = path[self._prefix_length:]
+                if os.sep != '/':
+                    target = target.replace(os.sep, '/')
+            else:
+                target = os.path.basename(path)
+            m = match(target)
+            if m is not None:
+                best = max(best, indexes[m.lastindex - 1])
+        if best < 0:
+            return None
+        return not self.rules[best].negated
+
+    def is_ignored(self, path, is_dir):
+        """
+        Check if an entry below base_path is ignored.
+
+        Args:
+            path (str): Entry path, joined from base_path
+            is_dir (bool): Whether the entry is a directory
+
+        Returns:
+            bool: True if the entry is ignored
+        """
+        matcher = self
+        while matcher is not None:
+            decision = matcher._match_level(path, is_dir)
+            if decision is not None:
+                return decision
+            matcher = matcher.parent
+        return False
+
+    def __repr__(self):
+        return f"IgnoreMatcher({self.base_path!r}, {len(self.rules)} rules)"
+
+class GitignoreRules:
+    """
+    Hierarchical ignore rules of a scanned tree, loaded lazily and cached per directory.
+
+    Only ignore files in root_path and below are read.
+
+    Args:
+        root_path (str): Root of the scanned tree
+        file_names (tuple): Names of the ignore files read in every directory
+        logger (logging.Logger): Logger for debug information
+    """
+
+    def __init__(self, root_path, file_names=IGNORE_FILE_NAMES, logger=None):
+        self.root_path = os.path.abspath(root_path)
+        self.file_names = tuple(file_names)
+        self.logger = logger
+        self._matchers = {}
+        self._stamps = {}
+
+    def __getstate__(self):
+        # Loggers and compiled matchers stay in the parent process
+        return {"root_path": self.root_path, "file_names": self.file_names}
+
+    def __setstate__(self, state):
+        self.__init__(state["root_path"], state["file_names"])
+
+    def _read_rules(self, dir_path):
+        """Read the rules of a directory's ignore files and record their (mtime, size) stamps."""
+        rules = []
+        stamps = []
+        for name in self.file_names:
+            stamp = None
+            try:
+                with open(os.path.join(dir_path, name), encoding='utf-8', errors='replace') as f:
+                    st = os.fstat(f.fileno())
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    rules.extend(parse_ignore_lines(f))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                if self.logger:
+                    self.logger.warning(f"Cannot read ignore file in {dir_path}: {e}")
+            stamps.append(stamp)
+        self._stamps[os.path.normpath(dir_path)] = tuple(stamps)
+        return rules
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _is_within_root(self, path):
+        """Check if path is root_path or below it, however either is spelled."""
+        path = os.path.abspath(path)
+        return os.path.commonpath([path, self.root_path]) == self.root_path
+
+    def for_directory(self, dir_path):
+        """
+        Get the rules that apply to the entries of a directory.
+
+        Args:
+            dir_path (str): Directory path at or below root_path, spelled
+                like the entry paths that are checked against it
+
+        Returns:
+            IgnoreMatcher: Rules in effect, None if there are none
+        """
+        key = os.path.normpath(dir_path)
+        if key in self._matchers:
+            return self._matchers[key]
+
+        # Parents are derived from dir_path itself, so anchored rules see
+        # entry paths with the same prefix they were loaded with
+        parent = None
+        if os.path.abspath(dir_path) != self.root_path:
+            parent_path = os.path.dirname(dir_path.rstrip(os.sep))
+            if parent_path and parent_path != dir_path and self._is_within_root(parent_path):
+                parent = self.for_directory(parent_path)
+
+        rules = self._read_rules(dir_path)
+        matcher = IgnoreMatcher(dir_path, rules, parent) if rules else parent
+        if rules and self.logger:
+            self.logger.debug(f"Loaded {len(rules)} ignore rules from {dir_path}")
+        self._matchers[key] = matcher
+        return matcher
+
+    def is_ignored(self, path, is_dir):
+        """
+        Check if an entry is ignored by the rules of its directory and the directories above.
+
+        Args:
+            path (str): Entry path
+            is_dir (bool): Whether the entry is a directory
+
+        Returns:
+            bool: True if the entry is ignored
+        """
+        matcher = self.for_directory(os.path.dirname(path))
+        return matcher is not None and matcher.is_ignored(path, is_dir)
+
+    def is_stale(self, dir_path):
+        """
+        Check if the ignore files of a directory changed since its rules were read.
+
+        Args:
+            dir_path (str): Directory path
+
+        Returns:
+            bool: True if an ignore file was created, deleted or modified; False if the rules were never read
+        """
+        stamps = self._stamps.get(os.path.normpath(dir_path))
+        if stamps is None:
+            return False
+        return stamps != tuple(self._stamp(os.path.join(dir_path, name)) for name in self.file_names)
+
+    def invalidate(self, dir_path):
+        """
+        Forget the rules of a directory and everything below it, so they are read again.
+
+        Args:
+            dir_path (str): Directory path
+        """
+        key = os.path.normpath(dir_path)
+        prefix = os.path.join(key, '')
+        for cached in (self._matchers, self._stamps):
+            for path in [path for path in cached if path == key or path.startswith(prefix)]:
+                del cached[path]
+
+    def clear(self):
+        """Forget all loaded rules, so changed ignore files are read again."""
+        self._matchers.clear()
+        self._stamps.clear()
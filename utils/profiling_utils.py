@@ -0,0 +1,240 @@
+"""
+Profiling utilities for directory structure analysis.
+
+A Profiler collects wall and CPU time per report phase, operation counters
+and the slowest directory listings. Instrumentation points only check
+whether a profiler was passed, so runs without --stats or --profile do no
+extra work.
+"""
+
+import json
+import time
+import heapq
+from collections import OrderedDict
+from utils.display_utils import write_table
+
+# Phases in report order; other phase names follow in the order they were first timed
+PHASES = ("scan", "structure", "content", "count", "chars", "write")
+
+# Counters reported by every profile, in report order
+COUNTERS = (
+    "directories_listed",
+    "listing_cache_hits",
+    "files_stated",
+    "files_read",
+    "files_skipped",
+    "file_cache_hits",
+    "bytes_read",
+    "lines_filtered",
+)
+
+class Profiler:
+    """
+    Collector of per-phase timings and counters for a single run.
+
+    CPU time is process time, so it includes every thread reading files
+    and can exceed the wall time with --jobs. The "write" phase measures
+    time spent writing the report and overlaps the other phases.
+
+    Args:
+        top_listings (int): Number of slowest directory listings to keep
+    """
+
+    def __init__(self, top_listings=10):
+        self.top_listings = top_listings
+        self.phases = OrderedDict()
+        self.counters = OrderedDict((name, 0) for name in COUNTERS)
+        self._listings = []
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def phase(self, name):
+        """
+        Time a block of code as part of a phase; repeated phases accumulate.
+
+        Args:
+            name (str): Phase name
+
+        Returns:
+            context manager: Timer of the block
+        """
+        return _Phase(self, name)
+
+    def add_time(self, name, wall, cpu):
+        """
+        Add wall and CPU seconds to a phase.
+
+        Args:
+            name (str): Phase name
+            wall (float): Wall clock seconds
+            cpu (float): CPU seconds
+        """
+        totals = self.phases.get(name)
+        if totals is None:
+            totals = self.phases[name] = [0.0, 0.0]
+        totals[0] += wall
+        totals[1] += cpu
+
+    def count(self, name, amount=1):
+        """
+        Increase a counter.
+
+        Args:
+            name (str): Counter name, one of COUNTERS
+            amount (int): Amount to add
+        """
+        self.counters[name] += amount
+
+    def record_listing(self, path, seconds):
+        """
+        Record a directory listing, keeping only the slowest ones.
+
+        Args:
+            path (str): Directory path
+            seconds (float): Time the listing took
+        """
+        self.counters["directories_listed"] += 1
+        if len(self._listings) < self.top_listings:
+            heapq.heappush(self._listings, (seconds, path))
+        elif self._listings and seconds > self._listings[0][0]:
+            heapq.heapreplace(self._listings, (seconds, path))
+
+    def slowest_listings(self):
+        """
+        Get the slowest directory listings recorded.
+
+        Returns:
+            list: Tuples (seconds, path), slowest first
+        """
+        return sorted(self._listings, reverse=True)
+
+    def wrap_stream(self, out):
+        """
+        Wrap an output stream so the time spent writing to it is recorded as the "write" phase.
+
+        Args:
+            out (file-like): Stream the report is written to
+
+        Returns:
+            file-like: Stream forwarding to out
+        """
+        return _TimedStream(out, self)
+
+    def to_dict(self):
+        """
+        Get the collected statistics as a JSON-serializable dict.
+
+        Returns:
+            dict: Total and per-phase times, counters and slowest listings
+        """
+        return OrderedDict([
+            ("total", {"wall": time.perf_counter() - self._wall_start, "cpu": time.process_time() - self._cpu_start}),
+            ("phases", OrderedDict((name, {"wall": wall, "cpu": cpu}) for name, (wall, cpu) in self._ordered_phases())),
+            ("counters", self.counters),
+            ("slowest_listings", [{"path": path, "seconds": seconds} for seconds, path in self.slowest_listings()]),
+        ])
+
+    def write_summary(self, out):
+        """
+        Write the statistics as tables.
+
+        Args:
+            out (file-like): Stream the tables are written to
+        """
+        wall_total = time.perf_counter() - self._wall_start
+        cpu_total = time.process_time() - self._cpu_start
+        rows = [(name, f"{wall:.3f}", f"{cpu:.3f}") for name, (wall, cpu) in self._ordered_phases()]
+        rows.append(("total", f"{wall_total:.3f}", f"{cpu_total:.3f}"))
+        write_table(out, ["Phase", "Wall (s)", "CPU (s)"], rows, ["l", "r", "r"])
+        out.write("\n\n")
+
+        write_table(out, ["Counter", "Value"], [(name.replace("_", " "), f"{value:,}") for name, value in self.counters.items()], ["l", "r"])
+        out.write("\n")
+
+        listings = self.slowest_listings()
+        if listings:
+            out.write(f"\nSlowest {len(listings)} directory listings:\n")
+            write_table(out, ["Time (ms)", "Directory"], [(f"{seconds * 1000:.3f}", path) for seconds, path in listings], ["r", "l"])
+            out.write("\n")
+
+    def _ordered_phases(self):
+        """Get the timed phases as (name, totals) pairs in report order."""
+        known = [(name, self.phases[name]) for name in PHASES if name in self.phases]
+        return known + [(name, totals) for name, totals in self.phases.items() if name not in PHASES]
+
+    def write_json(self, path):
+        """
+        Save the statistics as a JSON file.
+
+        Args:
+            path (str): Path of the JSON file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+class _Phase:
+    """Context manager adding the wall and CPU time of a block to a phase."""
+
+    __slots__ = ("profiler", "name", "wall", "cpu")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add_time(self.name, time.perf_counter() - self.wall, time.process_time() - self.cpu)
+        return False
+
+class _NullPhase:
+    """Context manager doing nothing, used when profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+def profile_phase(profiler, name):
+    """
+    Time a block as a phase of profiler, or do nothing if profiler is None.
+
+    Args:
+        profiler (Profiler): Profiler of the run, if any
+        name (str): Phase name
+
+    Returns:
+        context manager: Timer of the block
+    """
+    if profiler is None:
+        return _NULL_PHASE
+    return profiler.phase(name)
+
+class _TimedStream:
+    """Stream wrapper recording the time spent in write, flush and close as the "write" phase."""
+
+    def __init__(self, out, profiler):
+        self._out = out
+        self._profiler = profiler
+
+    def write(self, data):
+        with self._profiler.phase("write"):
+            return self._out.write(data)
+
+    def flush(self):
+        with self._profiler.phase("write"):
+            self._out.flush()
+
+    def close(self):
+        with self._profiler.phase("write"):
+            self._out.close()
+
+    def __getattr__(self, name):
+        return getattr(self._out, name)